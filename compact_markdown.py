@@ -0,0 +1,163 @@
+import asyncio
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import aiofiles
+from tqdm import tqdm
+
+CHARS_PER_TOKEN = 4  # Same rough estimate the summarizer budgets with
+MAX_BOILERPLATE_LINE = 100  # Running headers and footers are short lines
+MIN_REPEATS = 3  # A line seen this often is treated as page boilerplate
+MIN_PAGE_GAP = 15  # Lines between repeats for them to count as once per page
+MIN_LETTERS = 3  # Lines with fewer letters are data, e.g. a table row
+
+LIGATURES = {
+    "\ufb00": "ff",
+    "\ufb01": "fi",
+    "\ufb02": "fl",
+    "\ufb03": "ffi",
+    "\ufb04": "ffl",
+    "\ufb05": "st",
+    "\ufb06": "st",
+    "\u00ad": "",  # Soft hyphen
+    "\u00a0": " ",  # Non-breaking space
+    "\u2009": " ",  # Thin space
+    "\u200b": "",  # Zero-width space
+    "\ufffd": "",  # Replacement character from bad glyph maps
+}
+ODD_CHARS = re.compile("[" + "".join(LIGATURES) + "]")
+# "state-\nof-the-art" is a compound broken at its own hyphen, keep the hyphen
+HYPHENATED_COMPOUND = re.compile(r"(?<=[a-z]-)\n(?=[a-z]+-[a-z])")
+HYPHENATED_BREAK = re.compile(r"-(?<=[a-z]-)\n(?=[a-z])")
+PAGE_NUMBER_LINE = re.compile(
+    r"^[ \t]*(?:page[ \t]*)?\d{1,4}(?:[ \t]*(?:of|/)[ \t]*\d{1,4})?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+DIGITS = re.compile(r"\d+")
+LETTER = re.compile(r"[^\W\d_]")
+# Captions repeat legitimately ("Table 1", "Table 2", ...), never drop them
+CAPTION = re.compile(r"^(?:table|figure|fig\.|algorithm|listing)\b", re.IGNORECASE)
+REFERENCES_HEADING = re.compile(
+    r"^[ \t]*(?:\d+\.?[ \t]*)?(?:references|bibliography)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+APPENDIX_HEADING = re.compile(
+    r"^[ \t]*(?:[A-Z]\.?[ \t]+)?(?:appendix|appendices|supplementary material)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+INLINE_SPACE = re.compile(r" [ \t]+|\t[ \t]*")  # Single spaces are left alone
+TRAILING_SPACE = re.compile(r" \n")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drop short lines that repeat across pages, such as running headers.
+
+    Digits are ignored when comparing, so "Conference 2024, page 3" and
+    "Conference 2024, page 4" count as the same line. A line only counts as
+    boilerplate if its repeats are all at least MIN_PAGE_GAP lines apart and
+    it has some letters, so table rows and repeated pseudo-code survive.
+    """
+    lines = text.split("\n")
+    keys = [key.strip() for key in DIGITS.sub("#", text).split("\n")]
+    positions = defaultdict(list)
+    for i, key in enumerate(keys):
+        if 0 < len(key) <= MAX_BOILERPLATE_LINE:
+            positions[key].append(i)
+    repeated = set()
+    for key, where in positions.items():
+        if len(where) < MIN_REPEATS or CAPTION.match(key):
+            continue
+        # Running headers come once a page; lines that also repeat a few
+        # lines apart are content, such as "end for" in an algorithm
+        once_a_page = all(j - i >= MIN_PAGE_GAP for i, j in zip(where, where[1:]))
+        if once_a_page and len(LETTER.findall(key)) >= MIN_LETTERS:
+            repeated.add(key)
+    if not repeated:
+        return text
+    return "\n".join(line for line, key in zip(lines, keys) if key not in repeated)
+
+
+def drop_references(text: str) -> str:
+    """Remove the reference list, keeping any appendix that follows it."""
+    matches = list(REFERENCES_HEADING.finditer(text))
+    if not matches:
+        return text
+    start = matches[-1].start()
+    appendix = APPENDIX_HEADING.search(text, matches[-1].end())
+    return text[:start] + (text[appendix.start() :] if appendix else "")
+
+
+def compact_text(text: str, keep_references: bool = True) -> str:
+    """Strip extraction noise that costs input tokens but carries no content.
+
+    Normalizes ligatures and odd spaces, joins words hyphenated across line
+    breaks, drops page numbers and repeated running headers/footers,
+    optionally drops the reference list, and collapses whitespace. The
+    result depends only on the input, so it is safe to hash for caching.
+    """
+    text = ODD_CHARS.sub(lambda m: LIGATURES[m.group()], text)
+    text = HYPHENATED_COMPOUND.sub("", text)
+    text = HYPHENATED_BREAK.sub("", text)
+    text = PAGE_NUMBER_LINE.sub("", text)
+
+    text = strip_boilerplate(text)
+
+    if not keep_references:
+        text = drop_references(text)
+
+    text = INLINE_SPACE.sub(" ", text)
+    text = TRAILING_SPACE.sub("\n", text)
+    text = BLANK_LINES.sub("\n\n", text)
+    return text.strip() + "\n"
+
+
+def compaction_stats(original: str, compacted: str) -> dict:
+    saved = len(original) - len(compacted)
+    return {
+        "chars_before": len(original),
+        "chars_after": len(compacted),
+        "chars_saved": saved,
+        "tokens_saved": saved // CHARS_PER_TOKEN,
+    }
+
+
+async def compact_directory(
+    input_dir: str = "markdown/pypdf",
+    output_dir: str = "markdown/compact",
+    keep_references: bool = True,
+) -> list[dict]:
+    """Compact every markdown file and report the savings per file."""
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report = []
+
+    for file_path in tqdm(sorted(input_dir.glob("*.md")), desc="Compacting"):
+        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+            original = await f.read()
+        compacted = compact_text(original, keep_references)
+        async with aiofiles.open(
+            output_dir / file_path.name, "w", encoding="utf-8"
+        ) as f:
+            await f.write(compacted)
+        report.append({"file": file_path.name, **compaction_stats(original, compacted)})
+
+    async with aiofiles.open(output_dir / "compaction_report.json", "w") as f:
+        await f.write(json.dumps(report, indent=2))
+    return report
+
+
+async def main():
+    report = await compact_directory(keep_references=False)
+    before = sum(r["chars_before"] for r in report)
+    saved = sum(r["chars_saved"] for r in report)
+    print(
+        f"Compacted {len(report)} files: {saved} of {before} chars saved "
+        f"(~{saved // CHARS_PER_TOKEN} tokens)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
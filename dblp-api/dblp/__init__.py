@@ -1 +1,3 @@
-from dblp.api import search, add_ccf_class
+from dblp.api import search, search_async, add_ccf_class
+from dblp.cache import ResponseCache
+from dblp.local import LocalIndex, build_index
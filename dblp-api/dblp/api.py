@@ -1,53 +1,185 @@
+import asyncio
+import csv
+import functools
+import io
+import time
+
+import aiohttp
 import requests
-import pandas as pd
 
-from urllib.parse import urlencode
-from importlib.resources import open_binary
+from urllib.parse import urlencode, urlparse
+from importlib.resources import files
+
+from dblp.cache import ResponseCache
+from dblp.local import LocalIndex
 
 BASE_URL = 'https://dblp.org/search/publ/api'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 
-def add_ccf_class(results: list[dict]) -> list[dict]:
-    def get_ccf_class(venue: str | None, catalog: pd.DataFrame) -> str | None:
-        if venue is None:
-            return
-        if len(series := catalog.loc[catalog.get('abbr').str.lower() == venue.lower(), 'class']) > 0:
-            return series.item()
-        elif len(series := catalog.loc[catalog.get('url').str.contains(f'/{venue.lower()}/'), 'class']) > 0:
-            return series.item()
+@functools.cache
+def _load_ccf_index() -> tuple[dict[str, str], dict[str, str]]:
+    by_abbr = {}
+    by_slug = {}
+    raw = files('dblp.data').joinpath('ccf_catalog.csv').read_text(encoding='utf-8-sig')
+    for row in csv.DictReader(io.StringIO(raw)):
+        if abbr := row['abbr'].strip().lower():
+            by_abbr.setdefault(abbr, row['class'])
+        url = urlparse(row['url'])
+        if 'dblp' not in url.netloc:
+            continue
+        segments = [s for s in url.path.lower().split('/') if s]
+        if len(segments) >= 3 and segments[0] == 'db':
+            by_slug.setdefault(segments[2], row['class'])
+    return by_abbr, by_slug
+
+
+def get_ccf_class(venue: str | None) -> str | None:
+    if venue is None:
+        return
+    by_abbr, by_slug = _load_ccf_index()
+    venue = venue.lower()
+    return by_abbr.get(venue) or by_slug.get(venue)
 
-    catalog = pd.read_csv(open_binary('dblp.data', 'ccf_catalog.csv'))
+
+def add_ccf_class(results: list[dict]) -> list[dict]:
     for result in results:
-        result['ccf_class'] = get_ccf_class(result.get('venue'), catalog=catalog)
+        result['ccf_class'] = get_ccf_class(result.get('venue'))
     return results
 
 
-def search(queries: list[str]) -> list[dict]:
+def _empty_entry(query: str) -> dict:
+    return {
+        'query': query,
+        'title': None,
+        'year': None,
+        'venue': None,
+        'doi': None,
+        'url': None,
+        'bibtex': None,
+    }
+
+
+def _parse_response(query: str, r: dict) -> dict:
+    entry = _empty_entry(query)
+    hit = r.get('result').get('hits').get('hit')
+    if hit is not None:
+        info = hit[0].get('info')
+        entry['title'] = info.get('title')
+        entry['year'] = info.get('year')
+        entry['venue'] = info.get('venue')
+        entry['doi'] = info.get('doi')
+        entry['url'] = info.get('ee')
+        entry['bibtex'] = f'{info.get("url")}?view=bibtex'
+    return entry
+
+
+def _options(query: str) -> dict:
+    return {
+        'q': query,
+        'format': 'json',
+        'h': 1
+    }
+
+
+class _RateLimiter:
+    def __init__(self, rate: float | None):
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _retry_delay(response: aiohttp.ClientResponse, attempt: int, backoff: float) -> float:
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None and retry_after.isdigit():
+        return float(retry_after)
+    return backoff * 2 ** attempt
+
+
+async def _fetch(
+    session: aiohttp.ClientSession,
+    query: str,
+    semaphore: asyncio.Semaphore,
+    limiter: _RateLimiter,
+    base_url: str,
+    max_retries: int,
+    backoff: float,
+    cache: ResponseCache | None,
+) -> dict:
+    if cache is not None and (entry := cache.get(query, _options(query))) is not None:
+        return entry
+    async with semaphore:
+        for attempt in range(max_retries + 1):
+            await limiter.wait()
+            async with session.get(base_url, params=_options(query)) as response:
+                if response.status in RETRY_STATUSES and attempt < max_retries:
+                    delay = _retry_delay(response, attempt, backoff)
+                else:
+                    response.raise_for_status()
+                    entry = _parse_response(query, await response.json(content_type=None))
+                    if cache is not None:
+                        cache.set(query, _options(query), entry)
+                    return entry
+            await asyncio.sleep(delay)
+
+
+async def search_async(
+    queries: list[str],
+    concurrency: int = 8,
+    rate: float | None = 10,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    base_url: str = BASE_URL,
+    cache: ResponseCache | None = None,
+) -> list[dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = _RateLimiter(rate)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(
+            _fetch(session, query, semaphore, limiter, base_url, max_retries, backoff, cache)
+            for query in queries
+        ))
+
+
+def search(
+    queries: list[str],
+    concurrency: int | None = None,
+    cache: ResponseCache | None = None,
+    backend: str = 'online',
+    index: str | LocalIndex = 'dblp_index.sqlite3',
+    **kwargs,
+) -> list[dict]:
+    if backend == 'local':
+        if isinstance(index, LocalIndex):
+            return index.search(queries)
+        local = LocalIndex(index)
+        try:
+            return local.search(queries)
+        finally:
+            local.close()
+    if backend != 'online':
+        raise ValueError(f'unknown backend {backend!r}, expected "online" or "local"')
+    if concurrency is not None:
+        return asyncio.run(search_async(queries, concurrency=concurrency, cache=cache, **kwargs))
     results = []
     for query in queries:
-        entry = {
-            'query': query,
-            'title': None,
-            'year': None,
-            'venue': None,
-            'doi': None,
-            'url': None,
-            'bibtex': None,
-        }
-        options = {
-            'q': query,
-            'format': 'json',
-            'h': 1
-        }
-        r = requests.get(f'{BASE_URL}?{urlencode(options)}').json()
-        hit = r.get('result').get('hits').get('hit')
-        if hit is not None:
-            info = hit[0].get('info')
-            entry['title'] = info.get('title')
-            entry['year'] = info.get('year')
-            entry['venue'] = info.get('venue')
-            entry['doi'] = info.get('doi')
-            entry['url'] = info.get('ee')
-            entry['bibtex'] = f'{info.get("url")}?view=bibtex'
+        options = _options(query)
+        if cache is not None and (entry := cache.get(query, options)) is not None:
+            results.append(entry)
+            continue
+        entry = _parse_response(query, requests.get(f'{BASE_URL}?{urlencode(options)}').json())
+        if cache is not None:
+            cache.set(query, options, entry)
         results.append(entry)
     return results
@@ -0,0 +1,85 @@
+import json
+import sqlite3
+import time
+
+from pathlib import Path
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.casefold().split())
+
+
+class ResponseCache:
+    def __init__(self, path: str | Path = 'dblp_cache.sqlite3', ttl: float | None = 30 * 24 * 3600,
+                 max_entries: int | None = 100_000):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(query: str, options: dict) -> str:
+        options = {k: v for k, v in options.items() if k != 'q'}
+        return json.dumps([normalize_query(query), options], sort_keys=True)
+
+    def get(self, query: str, options: dict) -> dict | None:
+        key = self.make_key(query, options)
+        row = self.conn.execute('SELECT value, created FROM responses WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+        if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+            self.misses += 1
+            return None
+        self.conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+        self.conn.commit()
+        self.hits += 1
+        entry = json.loads(row[0])
+        entry['query'] = query
+        return entry
+
+    def set(self, query: str, options: dict, entry: dict):
+        now = time.time()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+            (self.make_key(query, options), json.dumps(entry), now, now),
+        )
+        self._trim()
+        self.conn.commit()
+
+    def evict(self):
+        if self.ttl is not None:
+            self.conn.execute('DELETE FROM responses WHERE created < ?', (time.time() - self.ttl,))
+        self._trim()
+        self.conn.commit()
+
+    def _trim(self):
+        if self.max_entries is not None:
+            size = self.conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            if size > self.max_entries:
+                self.conn.execute(
+                    'DELETE FROM responses WHERE key IN '
+                    '(SELECT key FROM responses ORDER BY accessed LIMIT ?)',
+                    (size - self.max_entries,),
+                )
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        size = self.conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'entries': size,
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,183 @@
+import gzip
+import html.entities
+import json
+import re
+import sqlite3
+import unicodedata
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+
+RECORD_TAGS = {'article', 'inproceedings', 'proceedings', 'book', 'incollection', 'phdthesis', 'mastersthesis'}
+FIELD_TAGS = {'author', 'title', 'year', 'journal', 'booktitle', 'ee'}
+DOI_PREFIX = 'https://doi.org/'
+REC_URL = 'https://dblp.org/rec/'
+CHUNK_SIZE = 1 << 20
+BATCH_SIZE = 10_000
+INDEX_VERSION = 1  # Bumped when the schema or normalize_title() changes
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_title(title: str) -> str:
+    return _NON_WORD.sub(' ', unicodedata.normalize('NFKC', title).casefold()).strip()
+
+
+class _RecordTarget:
+    def __init__(self, on_record):
+        self.on_record = on_record
+        self.record = None
+        self.field = None
+        self.depth = 0
+        self.text = []
+
+    def start(self, tag, attrib):
+        if self.field is not None:
+            self.depth += 1
+        elif tag in RECORD_TAGS:
+            self.record = {'key': attrib.get('key'), 'author': [], 'ee': []}
+        elif self.record is not None and tag in FIELD_TAGS:
+            self.field = tag
+            self.text = []
+
+    def end(self, tag):
+        if self.field is not None:
+            if self.depth:
+                self.depth -= 1
+                return
+            value = ''.join(self.text).strip()
+            if self.field in ('author', 'ee'):
+                self.record[self.field].append(value)
+            else:
+                self.record.setdefault(self.field, value)
+            self.field = None
+        elif self.record is not None and tag in RECORD_TAGS:
+            self.on_record(self.record)
+            self.record = None
+
+    def data(self, data):
+        if self.field is not None:
+            self.text.append(data)
+
+    def close(self):
+        pass
+
+
+def _iter_chunks(path: Path):
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _row(record: dict) -> tuple | None:
+    title = record.get('title')
+    if not title or not record['key']:
+        return None
+    ee = record['ee'][0] if record['ee'] else None
+    doi = next((e[len(DOI_PREFIX):] for e in record['ee'] if e.startswith(DOI_PREFIX)), None)
+    return (
+        record['key'],
+        title,
+        normalize_title(title),
+        record.get('year'),
+        record.get('booktitle') or record.get('journal'),
+        doi,
+        doi.lower() if doi else None,
+        ee,
+        json.dumps(record['author'], ensure_ascii=False),
+    )
+
+
+def build_index(dump: str | Path, index: str | Path = 'dblp_index.sqlite3') -> int:
+    conn = sqlite3.connect(index)
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('DROP TABLE IF EXISTS publications')
+    conn.execute(
+        'CREATE TABLE publications ('
+        'key TEXT PRIMARY KEY, title TEXT, norm_title TEXT, year TEXT, '
+        'venue TEXT, doi TEXT, doi_lower TEXT, ee TEXT, authors TEXT)'
+    )
+    batch = []
+    count = 0
+
+    def on_record(record):
+        nonlocal count
+        if (row := _row(record)) is None:
+            return
+        batch.append(row)
+        count += 1
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany('INSERT OR REPLACE INTO publications VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', batch)
+            batch.clear()
+
+    parser = ET.XMLParser(target=_RecordTarget(on_record))
+    parser.entity.update((name, chr(code)) for name, code in html.entities.name2codepoint.items())
+    for chunk in _iter_chunks(Path(dump)):
+        parser.feed(chunk)
+    parser.close()
+    conn.executemany('INSERT OR REPLACE INTO publications VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', batch)
+    conn.execute('CREATE INDEX publications_norm_title ON publications (norm_title)')
+    conn.execute('CREATE INDEX publications_doi ON publications (doi_lower)')
+    conn.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+    conn.commit()
+    conn.close()
+    return count
+
+
+class LocalIndex:
+    def __init__(self, index: str | Path = 'dblp_index.sqlite3'):
+        self.path = Path(index)
+        if not self.path.exists():
+            raise FileNotFoundError(f'{self.path} does not exist, build it with dblp.build_index first')
+        self.conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] < INDEX_VERSION:
+            self.conn.close()
+            raise RuntimeError(f'{self.path} was built by an older version, rebuild it with dblp.build_index')
+
+    def _entry(self, query: str, row: tuple | None) -> dict:
+        entry = {
+            'query': query,
+            'title': None,
+            'year': None,
+            'venue': None,
+            'doi': None,
+            'url': None,
+            'bibtex': None,
+        }
+        if row is not None:
+            key, title, year, venue, doi, ee = row
+            entry['title'] = title
+            entry['year'] = year
+            entry['venue'] = venue
+            entry['doi'] = doi
+            entry['url'] = ee
+            entry['bibtex'] = f'{REC_URL}{key}?view=bibtex'
+        return entry
+
+    def lookup(self, query: str) -> dict:
+        # Prefer the published version over its CoRR preprint, then the newest
+        row = self.conn.execute(
+            'SELECT key, title, year, venue, doi, ee FROM publications WHERE norm_title = ? '
+            "ORDER BY venue = 'CoRR', year DESC LIMIT 1",
+            (normalize_title(query),),
+        ).fetchone()
+        return self._entry(query, row)
+
+    def authors(self, key: str) -> list[str]:
+        row = self.conn.execute('SELECT authors FROM publications WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def lookup_doi(self, doi: str) -> dict:
+        row = self.conn.execute(
+            'SELECT key, title, year, venue, doi, ee FROM publications WHERE doi_lower = ? LIMIT 1',
+            (doi.lower(),),
+        ).fetchone()
+        return self._entry(doi, row)
+
+    def search(self, queries: list[str]) -> list[dict]:
+        return [self.lookup(query) for query in queries]
+
+    def close(self):
+        self.conn.close()
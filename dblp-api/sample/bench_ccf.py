@@ -0,0 +1,61 @@
+import csv
+import io
+import random
+import time
+
+from importlib.resources import files
+
+import fire
+
+import dblp
+from dblp.api import _load_ccf_index
+
+
+def legacy_add_ccf_class(results: list[dict]) -> list[dict]:
+    """The DataFrame-scanning implementation add_ccf_class replaced."""
+    import pandas as pd
+
+    def get_ccf_class(venue: str | None, catalog: pd.DataFrame) -> str | None:
+        if venue is None:
+            return
+        if len(series := catalog.loc[catalog.get('abbr').str.lower() == venue.lower(), 'class']) > 0:
+            return series.item()
+        elif len(series := catalog.loc[catalog.get('url').str.contains(f'/{venue.lower()}/'), 'class']) > 0:
+            return series.item()
+
+    catalog = pd.read_csv(files('dblp.data').joinpath('ccf_catalog.csv').open('rb'))
+    for result in results:
+        result['ccf_class'] = get_ccf_class(result.get('venue'), catalog=catalog)
+    return results
+
+
+def synthetic_results(size: int, seed: int = 0) -> list[dict]:
+    """Results whose venues are catalog abbreviations, plus some unknown or missing ones."""
+    raw = files('dblp.data').joinpath('ccf_catalog.csv').read_text(encoding='utf-8-sig')
+    abbrs = [row['abbr'].strip() for row in csv.DictReader(io.StringIO(raw)) if row['abbr'].strip()]
+    # The old path raises on abbreviations listed more than once, leave them out
+    unique = [abbr for abbr in abbrs if sum(a.lower() == abbr.lower() for a in abbrs) == 1]
+    rng = random.Random(seed)
+    venues = unique + ['CoRR', 'arXiv', None]
+    return [{'title': f'Paper {i}', 'venue': rng.choice(venues)} for i in range(size)]
+
+
+def main(size: int = 20000, skip_legacy: bool = False):
+    results = synthetic_results(size)
+
+    _load_ccf_index.cache_clear()
+    start = time.perf_counter()
+    new = dblp.add_ccf_class([dict(r) for r in results])
+    print(f'add_ccf_class:        {time.perf_counter() - start:.3f}s for {size} results')
+
+    if skip_legacy:
+        return
+    start = time.perf_counter()
+    old = legacy_add_ccf_class([dict(r) for r in results])
+    print(f'legacy_add_ccf_class: {time.perf_counter() - start:.3f}s for {size} results')
+    mismatches = sum(a['ccf_class'] != b['ccf_class'] for a, b in zip(new, old))
+    print(f'{mismatches} results classified differently')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
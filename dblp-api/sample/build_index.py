@@ -0,0 +1,12 @@
+import fire
+
+import dblp
+
+
+def main(dump: str, index: str = 'dblp_index.sqlite3'):
+    count = dblp.build_index(dump, index)
+    print(f'Indexed {count} publications into {index}')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
@@ -1,13 +1,18 @@
 import fire
 import json
+import sys
 
 import dblp
 
 
-def main(input: str, with_ccf_class: bool = False):
+def main(input: str, with_ccf_class: bool = False, concurrency: int | None = None, cache: str | None = None,
+         backend: str = 'online', index: str = 'dblp_index.sqlite3'):
     with open(input, 'r') as f:
         queries = f.read().splitlines()
-    results = dblp.search(queries)
+    response_cache = dblp.ResponseCache(cache) if cache else None
+    results = dblp.search(queries, concurrency=concurrency, cache=response_cache, backend=backend, index=index)
+    if response_cache is not None:
+        print(json.dumps(response_cache.stats()), file=sys.stderr)
     if with_ccf_class:
         results = dblp.add_ccf_class(results)
     print(json.dumps(results, indent=2, ensure_ascii=False))
@@ -1,6 +1,12 @@
 import asyncio
+import hashlib
+import json
 import os
+import random
 import re
+import shutil
+import time
+from collections import defaultdict
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -8,9 +14,230 @@ import aiofiles
 import aiohttp
 from tqdm import tqdm
 
+from paper_catalog import MARKDOWN_PATH, PaperCatalog
+
 DOWNLOAD_DIR = "papers"
-MAX_CONCURRENT_DOWNLOADS = 5  # Limit concurrent downloads to avoid rate limiting
-TIMEOUT = aiohttp.ClientTimeout(total=60)  # 60 second timeout
+MAX_CONCURRENT_DOWNLOADS = 32  # Global ceiling across all hosts
+MAX_PER_HOST = 4  # Concurrent downloads per host
+HOST_RATE = 1.0  # Sustained requests per second per host
+HOST_BURST = 4  # Requests a host may receive back to back
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# No total cap so large PDFs can finish; stalls are caught by the read timeout
+TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+CHUNK_SIZE = 64 * 1024
+MAX_FILE_SIZE = 200 * 1024 * 1024  # Refuse anything larger than 200 MB
+MAX_RETRIES = 3  # Extra attempts, resuming from the partial file
+BACKOFF_BASE = 1.0  # Seconds, doubled on every retry and jittered
+STORE_DIR = os.path.join(DOWNLOAD_DIR, ".store")  # Content-addressed PDFs
+MANIFEST_PATH = os.path.join(STORE_DIR, "manifest.json")
+DOI_PATTERN = re.compile(r"\b(10\.\d{4,9}/[^\s?#]+)", re.IGNORECASE)
+
+
+class RetryableStatus(Exception):
+    """Raised for responses that are worth retrying, such as 429 or 503."""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to a single host."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                wait = self.blocked_until - now
+                if wait <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                if wait <= 0:
+                    wait = (1 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def block(self, delay):
+        """Hold back every request to this host for ``delay`` seconds."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+
+class HostScheduler:
+    """Per-host concurrency caps and rate limits under a global ceiling."""
+
+    def __init__(
+        self,
+        max_concurrent=MAX_CONCURRENT_DOWNLOADS,
+        max_per_host=MAX_PER_HOST,
+        rate=HOST_RATE,
+        burst=HOST_BURST,
+    ):
+        self.global_semaphore = asyncio.Semaphore(max_concurrent)
+        self.host_semaphores = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+        self.buckets = defaultdict(lambda: TokenBucket(rate, burst))
+
+    def slot(self, url):
+        return _HostSlot(self, urlparse(url).netloc.lower())
+
+    def backoff(self, url, delay):
+        self.buckets[urlparse(url).netloc.lower()].block(delay)
+
+
+class _HostSlot:
+    def __init__(self, scheduler, host):
+        self.scheduler = scheduler
+        self.host = host
+
+    async def __aenter__(self):
+        # Take the host slot first so a backlog for one host never holds
+        # global slots that other hosts could use
+        await self.scheduler.host_semaphores[self.host].acquire()
+        try:
+            await self.scheduler.buckets[self.host].acquire()
+            await self.scheduler.global_semaphore.acquire()
+        except BaseException:
+            self.scheduler.host_semaphores[self.host].release()
+            raise
+
+    async def __aexit__(self, *exc):
+        self.scheduler.global_semaphore.release()
+        self.scheduler.host_semaphores[self.host].release()
+
+
+def make_connector():
+    """Shared connection pool with keep-alive and DNS caching."""
+    return aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_DOWNLOADS,
+        limit_per_host=MAX_PER_HOST,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+
+
+def retry_delay(attempt, retry_after=None):
+    """Jittered exponential backoff, never shorter than Retry-After."""
+    delay = BACKOFF_BASE * 2**attempt * random.uniform(0.5, 1.5)
+    return max(delay, retry_after or 0)
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_doi(url):
+    """Pull a DOI out of a URL such as https://doi.org/10.1145/..., if any."""
+    match = DOI_PATTERN.search(url)
+    return match.group(1).rstrip(".").lower() if match else None
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class PaperStore:
+    """Content-addressed PDF store keyed by SHA-256.
+
+    The manifest maps URLs, DOIs and titles to content hashes, so a paper that
+    is already known under any of them is never fetched again, and identical
+    bytes are kept once. Title-named files in DOWNLOAD_DIR are hard links (or
+    copies where links are unsupported) into the store.
+    """
+
+    def __init__(self, store_dir=STORE_DIR, manifest_path=MANIFEST_PATH):
+        self.store_dir = Path(store_dir)
+        self.manifest_path = Path(manifest_path)
+        (self.store_dir / "tmp").mkdir(parents=True, exist_ok=True)
+        self.manifest = {"objects": {}, "urls": {}, "dois": {}, "titles": {}}
+        self.locks = defaultdict(asyncio.Lock)
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest.update(json.load(f))
+
+    def save(self):
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def object_path(self, digest):
+        ext = self.manifest["objects"][digest]["ext"]
+        return self.store_dir / digest[:2] / f"{digest}{ext}"
+
+    def staging_path(self, url):
+        """Stable per-URL path so interrupted downloads can be resumed."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.store_dir / "tmp" / key
+
+    def lock(self, url, doi=None):
+        """Lock that serializes downloads of the same paper."""
+        return self.locks[doi or url]
+
+    def lookup(self, url, doi=None):
+        """Return the content hash already recorded for this URL or DOI."""
+        return self.manifest["urls"].get(url) or (
+            self.manifest["dois"].get(doi) if doi else None
+        )
+
+    def record(self, digest, url, doi, title):
+        self.manifest["urls"][url] = digest
+        if doi:
+            self.manifest["dois"][doi] = digest
+        self.manifest["titles"][title] = digest
+
+    async def add(self, staged_path, ext, url, doi, title):
+        """Move a finished download into the store and return its hash."""
+        digest = await asyncio.to_thread(file_sha256, staged_path)
+        if digest in self.manifest["objects"]:
+            os.remove(staged_path)  # Same bytes already stored under another name
+        else:
+            self.manifest["objects"][digest] = {
+                "ext": ext,
+                "size": os.path.getsize(staged_path),
+            }
+            object_path = self.object_path(digest)
+            object_path.parent.mkdir(exist_ok=True)
+            os.replace(staged_path, object_path)
+        self.record(digest, url, doi, title)
+        return digest
+
+    def link(self, digest, view_path):
+        """Expose a stored object under a title-based file name."""
+        view_path = Path(view_path)
+        object_path = self.object_path(digest)
+        if view_path.exists():
+            if os.path.samefile(view_path, object_path):
+                return view_path
+            if file_sha256(view_path) != digest:
+                # Different paper with a colliding sanitized title
+                view_path = view_path.with_stem(f"{view_path.stem}_{digest[:8]}")
+                if view_path.exists():
+                    return view_path
+            # Otherwise the same bytes, saved before the store existed: the
+            # copy is swapped for a link below instead of kept twice
+        tmp_path = view_path.with_name(f".{view_path.name}.tmp")
+        try:
+            os.link(object_path, tmp_path)
+        except OSError:
+            shutil.copyfile(object_path, tmp_path)
+        os.replace(tmp_path, view_path)
+        return view_path
 
 
 async def sanitize_filename(title):
@@ -21,75 +248,149 @@ async def sanitize_filename(title):
     return safe_title[:100]  # Limit filename length
 
 
-async def download_paper(session, title, url, semaphore, progress_bar):
-    """Download a single paper with rate limiting."""
-    async with semaphore:
+async def stream_to_file(session, url, filepath):
+    """Stream a URL to disk, resuming a previous partial download if present."""
+    part_path = f"{filepath}.part"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    async with session.get(url, timeout=TIMEOUT, headers=headers) as response:
+        if response.status == 416:
+            # Stale partial file that no longer matches the server, start over
+            os.remove(part_path)
+            return await stream_to_file(session, url, filepath)
+        if response.status in RETRY_STATUSES:
+            raise RetryableStatus(
+                response.status, parse_retry_after(response.headers.get("Retry-After"))
+            )
+        if response.status not in (200, 206):
+            print(f"\nFailed to download {url}: HTTP {response.status}")
+            return False
+        if response.status == 200:
+            offset = 0  # Server ignored the Range header
+        if offset + (response.content_length or 0) > MAX_FILE_SIZE:
+            print(f"\nSkipping {url}: larger than {MAX_FILE_SIZE} bytes")
+            return False
+
+        size = offset
+        async with aiofiles.open(part_path, "ab" if offset else "wb") as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    break
+                await f.write(chunk)
+
+    if size > MAX_FILE_SIZE:
+        os.remove(part_path)
+        print(f"\nSkipping {url}: larger than {MAX_FILE_SIZE} bytes")
+        return False
+    os.replace(part_path, filepath)
+    return True
+
+
+async def fetch_into_store(session, title, url, doi, ext, filepath, scheduler, store):
+    """Fetch a paper into the store unless it is already known.
+
+    Returns the path the paper was linked under, or None if it could not be
+    downloaded.
+    """
+    # Skip if the URL or DOI is already in the store
+    if digest := store.lookup(url, doi):
+        store.record(digest, url, doi, title)
+        return store.link(digest, filepath)
+
+    # A file already at ``filepath`` may be another paper whose title
+    # sanitizes to the same name, so fetch anyway and let link() pick a
+    # distinct name if the bytes differ
+    staged_path = store.staging_path(url)
+
+    for attempt in range(MAX_RETRIES + 1):
         try:
-            # Skip if URL is invalid or N/A
-            if url == "N/A" or not url.startswith(("http://", "https://")):
-                progress_bar.update(1)
-                return False
-
-            # Create safe filename
-            safe_title = await sanitize_filename(title)
-
-            # Determine file extension based on URL or default to .pdf
-            parsed_url = urlparse(url)
-            ext = os.path.splitext(parsed_url.path)[1] or ".pdf"
-            filename = f"{safe_title}{ext}"
-            filepath = os.path.join(DOWNLOAD_DIR, filename)
-
-            # Skip if file already exists
-            if os.path.exists(filepath):
-                progress_bar.update(1)
-                return True
-
-            async with session.get(url, timeout=TIMEOUT) as response:
-                if response.status == 200:
-                    async with aiofiles.open(filepath, "wb") as f:
-                        await f.write(await response.read())
-                    progress_bar.update(1)
-                    return True
-                else:
-                    print(f"\nFailed to download {title}: HTTP {response.status}")
-                    progress_bar.update(1)
-                    return False
-
-        except Exception as e:
-            print(f"\nError downloading {title}: {str(e)}")
+            async with scheduler.slot(url):
+                ok = await stream_to_file(session, url, staged_path)
+            break
+        except RetryableStatus as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt, e.retry_after)
+            if e.retry_after is not None:
+                scheduler.backoff(url, delay)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt)
+        await asyncio.sleep(delay)
+    if not ok:
+        return None
+    digest = await store.add(staged_path, ext, url, doi, title)
+    return store.link(digest, filepath)
+
+
+async def download_paper(session, title, url, scheduler, store, progress_bar, doi=None):
+    """Download a single paper with per-host rate limiting."""
+    try:
+        # Skip if URL is invalid or N/A
+        if url == "N/A" or not url.startswith(("http://", "https://")):
             progress_bar.update(1)
             return False
 
+        # Create safe filename
+        safe_title = await sanitize_filename(title)
 
-async def parse_markdown_and_download():
-    """Parse the markdown file and download all papers."""
-    # Create download directory if it doesn't exist
-    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+        # Determine file extension based on URL or default to .pdf
+        parsed_url = urlparse(url)
+        ext = os.path.splitext(parsed_url.path)[1] or ".pdf"
+        filename = f"{safe_title}{ext}"
+        filepath = os.path.join(DOWNLOAD_DIR, filename)
+
+        doi = doi or extract_doi(url)
+        async with store.lock(url, doi):
+            ok = await fetch_into_store(
+                session, title, url, doi, ext, filepath, scheduler, store
+            )
+        progress_bar.update(1)
+        return ok is not None
+
+    except Exception as e:
+        print(f"\nError downloading {title}: {str(e)}")
+        progress_bar.update(1)
+        return False
 
-    # Read and parse markdown file
-    papers = []
-    async with aiofiles.open("papers.md", "r", encoding="utf-8") as f:
-        content = await f.read()
 
-    # Parse markdown table rows
-    pattern = r"\|(.*?)\|(.*?)\|(.*?)\|\s*(\d*)\s*\|\s*\[Link\]\((.*?)\)\s*\|"
-    matches = re.finditer(pattern, content)
+async def download_from_catalog():
+    """Download every paper in the catalog that has a URL.
+
+    Papers that triage_papers.py ruled off-topic are skipped.
+    """
+    # Create download directory if it doesn't exist
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
-    for match in matches:
-        title = match.group(1).strip()
-        url = match.group(5).strip()
-        if title and url:  # Skip empty entries
-            papers.append((title, url))
+    catalog = PaperCatalog()
+    if not len(catalog) and os.path.exists(MARKDOWN_PATH):
+        # papers.md from before the catalog existed: import it once
+        print(f"Imported {catalog.import_markdown()} papers from {MARKDOWN_PATH}")
+    papers = [
+        (paper["title"], paper["url"], paper["doi"])
+        for paper in catalog.papers(with_url=True, relevant=True)
+    ]
+    off_topic = sum(1 for _ in catalog.papers(with_url=True, relevant=False))
+    catalog.close()
+    if off_topic:
+        print(f"Skipping {off_topic} papers triaged as off-topic")
 
-    # Set up async download with rate limiting
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
-    async with aiohttp.ClientSession() as session:
+    # Set up async download with per-host rate limiting
+    scheduler = HostScheduler()
+    store = PaperStore()
+    async with aiohttp.ClientSession(connector=make_connector()) as session:
         with tqdm(total=len(papers), desc="Downloading papers") as progress_bar:
             tasks = [
-                download_paper(session, title, url, semaphore, progress_bar)
-                for title, url in papers
+                download_paper(session, title, url, scheduler, store, progress_bar, doi)
+                for title, url, doi in papers
             ]
-            results = await asyncio.gather(*tasks)
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                store.save()
 
     # Print summary
     successful = sum(1 for r in results if r)
@@ -99,7 +400,7 @@ async def parse_markdown_and_download():
 
 
 async def main():
-    await parse_markdown_and_download()
+    await download_from_catalog()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,13 @@
+import argparse
 import asyncio
+import hashlib
 import json
 import os
+import re
 import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Literal
 
@@ -9,106 +15,547 @@ import aiofiles
 import PyPDF2
 from tqdm import tqdm
 
+sys.path.append("src")
+
+from extractors import NougatExtractor, cascade_pages, save_markdown, score_page
+from extractors.cascade import QUALITY_THRESHOLD
+from extractors.nougat import run_nougat
+
+PAGES_PER_TASK = 50  # Large PDFs are split into page ranges of this size
+# Smaller ranges when extracting selected sections, to stop close to the cut
+SELECTIVE_PAGES_PER_TASK = 8
+PDF_TIMEOUT = 300  # Seconds before a stuck extraction worker is killed
+NOUGAT_COMMAND = "nougat"
+NOUGAT_BATCH_SIZE = 8  # PDFs handed to one Nougat process, sharing one model load
+NOUGAT_CONCURRENCY = 1  # Nougat processes running at once
+# Bump when an extractor's output format changes to invalidate old outputs
+EXTRACTOR_VERSIONS = {
+    "pypdf": f"PyPDF2-{PyPDF2.__version__}",
+    "nougat": "nougat-ocr",
+    "cascade": f"PyPDF2-{PyPDF2.__version__}+nougat-ocr",
+}
+
+# Sections in the order they usually appear; "front" is title and authors,
+# "body" everything between the introduction and the conclusion
+SECTIONS = [
+    "front",
+    "abstract",
+    "introduction",
+    "body",
+    "conclusion",
+    "acknowledgements",
+    "references",
+    "appendix",
+]
+SECTION_HEADINGS = {
+    "abstract": "abstract",
+    "introduction": "introduction",
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+    "concluding remarks": "conclusion",
+    "acknowledgment": "acknowledgements",
+    "acknowledgments": "acknowledgements",
+    "acknowledgement": "acknowledgements",
+    "acknowledgements": "acknowledgements",
+    "references": "references",
+    "bibliography": "references",
+    "appendix": "appendix",
+    "appendices": "appendix",
+    "supplementary material": "appendix",
+}
+# A known heading alone on its line, capitalized or upper-case and optionally
+# numbered ("1", "IV.", "A"); a wrapped prose line starting with "references"
+# must not end the paper early
+_HEADING_FORMS = sorted(
+    {
+        form
+        for heading in SECTION_HEADINGS
+        for form in (heading.capitalize(), heading.title(), heading.upper())
+    },
+    key=len,
+    reverse=True,
+)
+HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:(?:\d+|[IVX]+|[A-Z])\.?[ \t]+)?("
+    + "|".join(_HEADING_FORMS)
+    + r")[ \t]*[.:]?[ \t]*$",
+    re.MULTILINE,
+)
+# Appendix headings usually carry a label and title: "Appendix A: Proofs"
+APPENDIX_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(Appendix|APPENDIX)[ \t]+[A-Z\d]{1,2}\b[ \t]*(?:[.:\u2014-][^\n]{0,80})?$",
+    re.MULTILINE,
+)
+# IEEE-style run-in abstract: "Abstract", a dash or colon, then the text
+INLINE_ABSTRACT_PATTERN = re.compile(
+    r"^[ \t]*abstract[ \t]*[\u2014\u2013:.-][ \t]*\S", re.IGNORECASE | re.MULTILINE
+)
+
+
+# The first numbered heading after the introduction starts the body
+NUMBERED_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:\d+|[IVX]+)\.?[ \t]+[A-Z][A-Za-z][^\n]{0,40}$", re.MULTILINE
+)
+
+
+def split_sections(page_text: str, current: str) -> list[tuple[str, str]]:
+    """Split one page into (section, text) pieces at recognized headings.
+
+    ``current`` is the section the previous page ended in. Sections only move
+    forward, so a stray "Introduction" in the references is not a boundary.
+    """
+    boundaries = [
+        (match.start(), SECTION_HEADINGS[match.group(1).lower()])
+        for pattern in (HEADING_PATTERN, APPENDIX_HEADING_PATTERN)
+        for match in pattern.finditer(page_text)
+    ]
+    boundaries += [
+        (match.start(), "abstract")
+        for match in INLINE_ABSTRACT_PATTERN.finditer(page_text)
+    ]
+    if current in ("front", "abstract", "introduction"):
+        boundaries += [
+            (match.start(), "body")
+            for match in NUMBERED_HEADING_PATTERN.finditer(page_text)
+        ]
+
+    pieces = []
+    start = 0
+    for position, section in sorted(boundaries):
+        if SECTIONS.index(section) <= SECTIONS.index(current):
+            continue
+        if section == "body" and current != "introduction":
+            continue  # Only a heading after the introduction opens the body
+        pieces.append((current, page_text[start:position]))
+        current, start = section, position
+    pieces.append((current, page_text[start:]))
+    return pieces
+
+
+def extract_pages(
+    pdf_path: Path, start: int = 0, stop: int | None = None
+) -> tuple[list[str], int]:
+    """Extract the text of pages [start, stop) (runs in a worker process).
+
+    Also returns the total page count so the caller can schedule the rest.
+    """
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        texts = [page.extract_text() for page in reader.pages[start:stop]]
+        return texts, len(reader.pages)
+
+
+class ExtractionEngine:
+    """Runs CPU-bound extraction in a process pool with per-call timeouts.
+
+    At most ``workers`` calls are submitted at once, so a call's timeout
+    starts when a worker picks it up rather than while it waits in the
+    pool's queue. A call that exceeds it takes the whole pool down with it,
+    since executors cannot cancel a running task; calls that were sharing
+    the broken pool are resubmitted once to the fresh one.
+    """
+
+    def __init__(self, workers: int | None = None, timeout: float = PDF_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.executor = ProcessPoolExecutor(self.workers)
+        self.slots = asyncio.Semaphore(self.workers)
+
+    def restart(self):
+        for process in list((self.executor._processes or {}).values()):
+            process.kill()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(self.workers)
+
+    async def run(self, func, *args):
+        async with self.slots:
+            return await self._run(func, *args)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, func, *args), self.timeout
+                )
+            except asyncio.TimeoutError:
+                if executor is self.executor:
+                    self.restart()
+                raise
+            except BrokenProcessPool:
+                if attempt:
+                    raise
+                if executor is self.executor:
+                    self.restart()
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
 
 class PDFExtractor:
-    def __init__(self, input_dir: str = "papers", output_dir: str = "markdown"):
+    def __init__(
+        self,
+        input_dir: str = "papers",
+        output_dir: str = "markdown",
+        workers: int | None = None,
+        timeout: float = PDF_TIMEOUT,
+        nougat_command: str = NOUGAT_COMMAND,
+        nougat_batch_size: int = NOUGAT_BATCH_SIZE,
+        nougat_concurrency: int = NOUGAT_CONCURRENCY,
+        sections: list[str] | None = None,
+        page_budget: int | None = None,
+        cascade_threshold: float = QUALITY_THRESHOLD,
+    ):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.engine = ExtractionEngine(workers, timeout)
+        self.nougat_command = nougat_command
+        self.nougat_batch_size = nougat_batch_size
+        self.nougat_concurrency = nougat_concurrency
+        # Shared by batch and cascade runs, each process loads the model
+        self.nougat_semaphore = asyncio.Semaphore(nougat_concurrency)
+
+        # Selective PyPDF2 extraction: keep only these sections / pages
+        unknown = set(sections or []) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections {unknown}, expected {SECTIONS}")
+        self.sections = sections
+        self.page_budget = page_budget
+        self.pypdf_options = {
+            "sections": sorted(sections) if sections else None,
+            "page_budget": page_budget,
+        }
+        self.dropped_ranges: dict[Path, list[dict]] = {}
+
+        # Cascade: PyPDF2 for every page, Nougat only for pages scoring
+        # below the threshold (scans, broken glyphs, typeset math)
+        self.cascade_threshold = cascade_threshold
+        self.cascade_ocr = NougatExtractor(
+            nougat_command, semaphore=self.nougat_semaphore
+        )
+        self.cascade_stats = {"pages": 0, "ocr_pages": 0}
 
         # Create subdirectories for each extractor
         self.pypdf_dir = self.output_dir / "pypdf"
         self.nougat_dir = self.output_dir / "nougat"
+        self.cascade_dir = self.output_dir / "cascade"
         self.pypdf_dir.mkdir(exist_ok=True)
         self.nougat_dir.mkdir(exist_ok=True)
+        self.cascade_dir.mkdir(exist_ok=True)
+
+        # (PDF hash, extractor, version) recorded for every output file
+        self.manifest_path = self.output_dir / "extraction_manifest.json"
+        self.manifest = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def save_manifest(self):
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    async def fingerprint(self, pdf_path: Path) -> str:
+        """SHA-256 of the PDF, reusing the recorded hash if size and mtime match."""
+        stat = pdf_path.stat()
+        for output_path in (
+            self.pypdf_dir / f"{pdf_path.stem}_pypdf.md",
+            self.nougat_dir / f"{pdf_path.stem}_nougat.md",
+            self.cascade_dir / f"{pdf_path.stem}_cascade.md",
+        ):
+            entry = self.manifest.get(str(output_path))
+            if (
+                entry is not None
+                and entry["pdf"] == str(pdf_path)
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime
+            ):
+                return entry["sha256"]
+
+        def digest():
+            with open(pdf_path, "rb") as f:
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+        return await asyncio.to_thread(digest)
+
+    def is_up_to_date(self, output_path: Path, sha256: str, extractor: str) -> bool:
+        entry = self.manifest.get(str(output_path))
+        return (
+            entry is not None
+            and output_path.exists()
+            and entry["sha256"] == sha256
+            and entry["extractor"] == extractor
+            and entry["version"] == EXTRACTOR_VERSIONS[extractor]
+            and entry.get("options") == self.options_for(extractor)
+        )
+
+    def options_for(self, extractor: str) -> dict | None:
+        if extractor == "cascade":
+            return {"threshold": self.cascade_threshold}
+        return self.pypdf_options if extractor == "pypdf" else None
+
+    def record_output(
+        self, output_path: Path, pdf_path: Path, sha256: str, extractor: str
+    ):
+        stat = pdf_path.stat()
+        self.manifest[str(output_path)] = {
+            "pdf": str(pdf_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": sha256,
+            "extractor": extractor,
+            "version": EXTRACTOR_VERSIONS[extractor],
+            "options": self.options_for(extractor),
+        }
+        if extractor == "pypdf" and pdf_path in self.dropped_ranges:
+            self.manifest[str(output_path)]["dropped"] = self.dropped_ranges.pop(
+                pdf_path
+            )
 
     async def extract_with_pypdf(self, pdf_path: Path) -> str | None:
-        """Extract text using PyPDF2."""
+        """Extract text using PyPDF2, fanning large PDFs out by page range."""
+        if self.sections is not None or self.page_budget is not None:
+            return await self.extract_sections_with_pypdf(pdf_path)
         try:
-            text = []
-            with open(pdf_path, "rb") as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    text.append(page.extract_text())
-
-            return "\n\n".join(text)
+            return "\n\n".join(await self.pypdf_pages(pdf_path))
+        except asyncio.TimeoutError:
+            print(f"Timed out extracting text from {pdf_path} with PyPDF2")
+            return None
         except Exception as e:
             print(f"Error extracting text from {pdf_path} with PyPDF2: {e}")
             return None
 
-    async def extract_with_nougat(self, pdf_path: Path) -> str:
-        """Extract text using Nougat."""
+    async def pypdf_pages(self, pdf_path: Path) -> list[str]:
+        """PyPDF2 text of every page, fanning large PDFs out by page range."""
+        first, num_pages = await self.engine.run(
+            extract_pages, pdf_path, 0, PAGES_PER_TASK
+        )
+        rest = await asyncio.gather(
+            *(
+                self.engine.run(extract_pages, pdf_path, start, start + PAGES_PER_TASK)
+                for start in range(PAGES_PER_TASK, num_pages, PAGES_PER_TASK)
+            )
+        )
+        return [text or "" for text in first + [t for chunk, _ in rest for t in chunk]]
+
+    async def extract_with_cascade(self, pdf_path: Path) -> str | None:
+        """Extract with PyPDF2, re-running only its poor pages through Nougat."""
         try:
-            output_path = self.nougat_dir / f"{pdf_path.stem}_nougat.mmd"
-
-            # Run nougat-ocr command
-            process = await asyncio.create_subprocess_exec(
-                "nougat",
-                str(pdf_path),
-                "--out",
-                str(self.nougat_dir),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            pages = await self.pypdf_pages(pdf_path)
+            texts = await cascade_pages(
+                pages, self.cascade_ocr, pdf_path, self.cascade_threshold
             )
+        except asyncio.TimeoutError:
+            print(f"Timed out extracting text from {pdf_path} with PyPDF2")
+            return None
+        except Exception as e:
+            print(f"Error extracting text from {pdf_path} with cascade: {e}")
+            return None
+        self.cascade_stats["pages"] += len(pages)
+        self.cascade_stats["ocr_pages"] += sum(
+            score_page(text) < self.cascade_threshold for text in pages
+        )
+        return "\n\n".join(text for text in texts if text)
+
+    async def extract_sections_with_pypdf(self, pdf_path: Path) -> str | None:
+        """Extract only the selected sections, within the page budget.
+
+        Pages are read in order, one range at a time, so extraction stops as
+        soon as every remaining page would be dropped (typically at the
+        references). Dropped page ranges are kept in ``dropped_ranges`` and
+        end up in the manifest.
+        """
+        keep = set(self.sections or SECTIONS)
+        last_kept = max(SECTIONS.index(section) for section in keep)
+        budget = self.page_budget or float("inf")
+        kept, dropped = [], []
+        current = "front"
 
-            await process.communicate()
+        def drop(section, page):
+            if dropped and dropped[-1]["section"] == section:
+                dropped[-1]["pages"][1] = page + 1
+            else:
+                dropped.append({"section": section, "pages": [page + 1, page + 1]})
+
+        try:
+            page, num_pages = 0, None
 
-            # Read the generated markdown file
-            if output_path.exists():
-                async with aiofiles.open(output_path, "r", encoding="utf-8") as f:
-                    return await f.read()
-            return ""
+            def done():
+                return page >= budget or SECTIONS.index(current) > last_kept
 
+            while (num_pages is None or page < num_pages) and not done():
+                texts, num_pages = await self.engine.run(
+                    extract_pages, pdf_path, page, page + SELECTIVE_PAGES_PER_TASK
+                )
+                for text in texts:
+                    if done():
+                        break
+                    for section, piece in split_sections(text, current):
+                        if section in keep:
+                            kept.append(piece)
+                        elif piece.strip():
+                            drop(section, page)
+                        current = section
+                    page += 1
+
+            if page < num_pages:
+                # Everything past here was never extracted
+                reason = "page budget" if page >= budget else current
+                if dropped and dropped[-1]["section"] == reason:
+                    dropped[-1]["pages"][1] = num_pages
+                else:
+                    dropped.append({"section": reason, "pages": [page + 1, num_pages]})
+            self.dropped_ranges[pdf_path] = dropped
+            return "\n\n".join(piece.strip() for piece in kept if piece.strip())
+        except asyncio.TimeoutError:
+            print(f"Timed out extracting text from {pdf_path} with PyPDF2")
+            return None
         except Exception as e:
-            print(f"Error extracting text from {pdf_path} with Nougat: {e}")
-            return ""
+            print(f"Error extracting text from {pdf_path} with PyPDF2: {e}")
+            return None
 
-    async def save_markdown(self, content: str, output_path: Path) -> bool:
-        """Save extracted text as markdown. Returns True if successful."""
+    async def extract_with_nougat(self, pdf_path: Path) -> str:
+        """Extract text using Nougat."""
+        results = await self.extract_with_nougat_batch([pdf_path])
+        return results.get(pdf_path, "")
+
+    async def extract_with_nougat_batch(self, pdf_paths: list[Path]) -> dict[Path, str]:
+        """Extract many PDFs with a single Nougat process.
+
+        Loading the model dominates the cost for short papers, so one
+        invocation per batch pays it once. Returns the text for every PDF
+        Nougat produced output for.
+        """
+        results = {}
         try:
-            # Skip empty or whitespace-only content
-            if not content or not content.strip():
-                return False
+            returncode, stderr = await run_nougat(
+                self.nougat_command, pdf_paths, self.nougat_dir
+            )
+
+            # Nougat writes <stem>.mmd for every PDF it managed to convert
+            for pdf_path in pdf_paths:
+                output_path = self.nougat_dir / f"{pdf_path.stem}.mmd"
+                if output_path.exists():
+                    async with aiofiles.open(output_path, "r", encoding="utf-8") as f:
+                        results[pdf_path] = await f.read()
+                    output_path.unlink()
+
+            if returncode != 0 or len(results) < len(pdf_paths):
+                missing = [p.name for p in pdf_paths if p not in results]
+                print(
+                    f"Nougat exited with {returncode}, no output for "
+                    f"{missing}:\n{stderr}"
+                )
 
-            async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
-                await f.write(content)
-            return True
         except Exception as e:
-            print(f"Error saving markdown to {output_path}: {e}")
-            return False
+            names = ", ".join(p.name for p in pdf_paths)
+            print(f"Error extracting text from {names} with Nougat: {e}")
+        return results
 
     async def process_single_pdf(
-        self, pdf_path: Path, extractor: Literal["pypdf", "nougat", "both"] = "both"
+        self,
+        pdf_path: Path,
+        extractor: Literal["pypdf", "nougat", "both", "cascade"] = "both",
+        force: bool = False,
     ):
-        """Process a single PDF file with specified extractor(s)."""
-        results = []
+        """Process a single PDF file with specified extractor(s).
+
+        Outputs already recorded for the same PDF content and extractor
+        version are skipped unless ``force`` is set.
+        """
+        sha256 = await self.fingerprint(pdf_path)
 
         if extractor in ["pypdf", "both"]:
             pypdf_output = self.pypdf_dir / f"{pdf_path.stem}_pypdf.md"
-            text = await self.extract_with_pypdf(pdf_path)
-            if text:  # Only save if we got content
-                success = await self.save_markdown(text, pypdf_output)
-                if not success:
-                    print(f"Skipping empty PyPDF2 output for {pdf_path.name}")
+            if force or not self.is_up_to_date(pypdf_output, sha256, "pypdf"):
+                text = await self.extract_with_pypdf(pdf_path)
+                if text:  # Only save if we got content
+                    success = await save_markdown(text, pypdf_output)
+                    if success:
+                        self.record_output(pypdf_output, pdf_path, sha256, "pypdf")
+                    else:
+                        print(f"Skipping empty PyPDF2 output for {pdf_path.name}")
 
         if extractor in ["nougat", "both"]:
             nougat_output = self.nougat_dir / f"{pdf_path.stem}_nougat.md"
-            text = await self.extract_with_nougat(pdf_path)
-            if text:  # Only save if we got content
-                success = await self.save_markdown(text, nougat_output)
-                if not success:
-                    print(f"Skipping empty Nougat output for {pdf_path.name}")
+            if force or not self.is_up_to_date(nougat_output, sha256, "nougat"):
+                text = await self.extract_with_nougat(pdf_path)
+                if text:  # Only save if we got content
+                    success = await save_markdown(text, nougat_output)
+                    if success:
+                        self.record_output(nougat_output, pdf_path, sha256, "nougat")
+                    else:
+                        print(f"Skipping empty Nougat output for {pdf_path.name}")
+
+        if extractor == "cascade":
+            cascade_output = self.cascade_dir / f"{pdf_path.stem}_cascade.md"
+            if force or not self.is_up_to_date(cascade_output, sha256, "cascade"):
+                text = await self.extract_with_cascade(pdf_path)
+                if text and await save_markdown(text, cascade_output):
+                    self.record_output(cascade_output, pdf_path, sha256, "cascade")
+                elif text is not None:
+                    print(f"Skipping empty cascade output for {pdf_path.name}")
 
     async def process_all_pdfs(
-        self, extractor: Literal["pypdf", "nougat", "both"] = "both"
+        self,
+        extractor: Literal["pypdf", "nougat", "both", "cascade"] = "both",
+        max_in_flight: int | None = None,
+        force: bool = False,
     ):
-        """Process all PDFs in the input directory."""
+        """Process new or changed PDFs in the input directory concurrently."""
         pdf_files = list(self.input_dir.glob("*.pdf"))
+        # Keep a couple of PDFs queued per worker, but never the whole corpus
+        semaphore = asyncio.Semaphore(max_in_flight or 2 * self.engine.workers)
+
+        async def process(pdf_path: Path):
+            async with semaphore:
+                await self.process_single_pdf(pdf_path, per_pdf, force)
+
+        # Nougat over whole PDFs runs in batches below, the rest per PDF
+        per_pdf = "cascade" if extractor == "cascade" else "pypdf"
+        try:
+            if extractor in ["pypdf", "both", "cascade"]:
+                with tqdm(total=len(pdf_files), desc="Processing PDFs") as pbar:
+                    for task in asyncio.as_completed([process(p) for p in pdf_files]):
+                        await task
+                        pbar.update(1)
+            if extractor in ["nougat", "both"]:
+                await self.process_nougat_batches(pdf_files, force)
+        finally:
+            self.save_manifest()
+
+    async def process_nougat_batches(self, pdf_files: list[Path], force: bool = False):
+        """Run Nougat over the PDFs that need it, a batch per process."""
+        pending = []
+        for pdf_path in pdf_files:
+            sha256 = await self.fingerprint(pdf_path)
+            output = self.nougat_dir / f"{pdf_path.stem}_nougat.md"
+            if force or not self.is_up_to_date(output, sha256, "nougat"):
+                pending.append((pdf_path, sha256))
 
-        with tqdm(total=len(pdf_files), desc="Processing PDFs") as pbar:
-            for pdf_path in pdf_files:
-                await self.process_single_pdf(pdf_path, extractor)
-                pbar.update(1)
+        batches = [
+            pending[i : i + self.nougat_batch_size]
+            for i in range(0, len(pending), self.nougat_batch_size)
+        ]
+
+        async def process(batch):
+            async with self.nougat_semaphore:
+                texts = await self.extract_with_nougat_batch([p for p, _ in batch])
+            for pdf_path, sha256 in batch:
+                output = self.nougat_dir / f"{pdf_path.stem}_nougat.md"
+                text = texts.get(pdf_path)
+                if text and await save_markdown(text, output):
+                    self.record_output(output, pdf_path, sha256, "nougat")
+                elif pdf_path in texts:
+                    print(f"Skipping empty Nougat output for {pdf_path.name}")
+            return len(batch)
+
+        with tqdm(total=len(pending), desc="Running Nougat") as pbar:
+            for task in asyncio.as_completed([process(b) for b in batches]):
+                pbar.update(await task)
 
     async def generate_comparison_report(self):
         """Generate a comparison report of the extractions."""
@@ -143,10 +590,37 @@ class PDFExtractor:
 
 
 async def main():
-    extractor = PDFExtractor()
+    parser = argparse.ArgumentParser(description="Extract text from downloaded PDFs")
+    parser.add_argument(
+        "--extractor",
+        choices=["pypdf", "nougat", "both", "cascade"],
+        default="pypdf",
+        help="cascade: PyPDF2, with Nougat only for pages it extracts poorly",
+    )
+    parser.add_argument(
+        "--sections",
+        nargs="+",
+        choices=SECTIONS,
+        metavar="SECTION",
+        help="keep only these sections of the PyPDF2 text, e.g. abstract "
+        "introduction body conclusion",
+    )
+    parser.add_argument(
+        "--page-budget",
+        type=int,
+        help="stop PyPDF2 extraction after this many pages",
+    )
+    args = parser.parse_args()
+
+    extractor = PDFExtractor(sections=args.sections, page_budget=args.page_budget)
 
-    # Process PDFs with both extractors
-    await extractor.process_all_pdfs(extractor="pypdf")
+    try:
+        await extractor.process_all_pdfs(extractor=args.extractor)
+    finally:
+        extractor.engine.close()
+    if args.extractor == "cascade":
+        stats = extractor.cascade_stats
+        print(f"Cascade: {stats['ocr_pages']}/{stats['pages']} pages sent to Nougat")
 
     # Generate comparison report
     await extractor.generate_comparison_report()
@@ -1,66 +1,71 @@
 import asyncio
 import sys
+from contextlib import aclosing
 
-import aiofiles
-from scholarly import scholarly
-
-
-async def write_paper_to_file(paper, file):
-    """Write a single paper entry to the markdown file."""
-    row = (
-        f"| {paper['title']} | {paper['authors']} | "
-        f"{paper['year']} | {paper['citations']} | "
-        f"[Link]({paper['link']}) |\n"
-    )
-    await file.write(row)
+sys.path.append("src")
 
+from scholarly import scholarly
 
-async def init_markdown_file():
-    """Initialize the markdown file with headers."""
-    async with aiofiles.open("papers.md", "w", encoding="utf-8") as f:
-        await f.write("# LLM for Security 相关文章\n\n")
-        await f.write("| 标题 | 作者 | 年份 | 引用次数 | 链接 |\n")
-        await f.write("| ---- | ---- | ---- | -------- | ---- |\n")
+from core.threaded_iter import PREFETCH, iterate_in_thread
+from paper_catalog import PaperCatalog
 
 
-async def process_paper(pub, outfile):
-    """Process a single paper and write it to file."""
+async def process_paper(pub, catalog):
+    """Process a single paper and record it in the catalog."""
     try:
         paper = {
             "title": pub["bib"].get("title", "N/A"),
-            "authors": ", ".join(pub["bib"].get("author", ["N/A"])),
+            "authors": pub["bib"].get("author", []),
             "year": pub["bib"].get("pub_year", "N/A"),
+            "venue": pub["bib"].get("venue", "N/A"),
             "citations": pub.get("num_citations", "N/A"),
-            "link": pub.get("pub_url") or pub.get("eprint_url", "N/A"),
+            "url": pub.get("pub_url") or pub.get("eprint_url", "N/A"),
+            "abstract": pub["bib"].get("abstract"),
         }
-        await write_paper_to_file(paper, outfile)
+        catalog.upsert([paper], "scholar")
         print(f"Processed: {paper['title']}")
     except Exception as e:
         print(f"Error processing paper: {e}", file=sys.stderr)
 
 
-async def fetch_papers(query):
-    """Fetch papers and stream results to file."""
-    await init_markdown_file()
+async def iter_pubs(query, limit=None, prefetch=PREFETCH):
+    """Yield Scholar results as they arrive, without blocking the event loop.
 
-    search_query = scholarly.search_pubs(query)
-    async with aiofiles.open("papers.md", "a", encoding="utf-8") as f:
-        while True:
-            try:
-                pub = next(search_query)
-                await process_paper(pub, f)
-                await f.flush()  # Ensure immediate writing to disk
-            except StopIteration:
-                print("No more papers found", file=sys.stderr)
+    scholarly fetches result pages with blocking requests, so the search runs
+    in its own thread, at most `prefetch` results ahead of the consumer.
+    """
+    count = 0
+    pubs = iterate_in_thread(lambda: scholarly.search_pubs(query), prefetch)
+    async with aclosing(pubs):
+        async for pub in pubs:
+            yield pub
+            count += 1
+            if limit and count >= limit:
                 break
-            except Exception as e:
-                print(f"Error fetching paper: {e}", file=sys.stderr)
-                continue
+
+
+async def fetch_papers(query, catalog, limit=None):
+    """Fetch papers for one query, recording each one as it arrives."""
+    try:
+        async for pub in iter_pubs(query, limit):
+            await process_paper(pub, catalog)
+    except Exception as e:
+        print(f"Error fetching papers for {query!r}: {e}", file=sys.stderr)
+    else:
+        print(f"No more papers found for {query!r}", file=sys.stderr)
 
 
 async def main():
-    query = "LLM for Security"
-    await fetch_papers(query)
+    # Several queries are searched concurrently, each in its own thread
+    queries = sys.argv[1:] or ["LLM for Security"]
+    catalog = PaperCatalog()
+    try:
+        await asyncio.gather(*(fetch_papers(query, catalog) for query in queries))
+    finally:
+        # papers.md is a view of the catalog, near-duplicate titles merged
+        catalog.dedupe()
+        catalog.render_markdown()
+        catalog.close()
 
 
 if __name__ == "__main__":
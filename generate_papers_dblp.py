@@ -1,16 +1,23 @@
 import logging
+import os
 import sys
 
 sys.path.append("dblp-api")
 
 import dblp
+from paper_catalog import PaperCatalog
 
 logging.basicConfig(level=logging.INFO)
 
+# Set DBLP_CACHE to a file path to reuse DBLP responses across runs
+DBLP_CACHE = os.getenv("DBLP_CACHE")
 
-def fetch_papers(query: str, max_results: int = 100) -> list:
+
+def fetch_papers(
+    query: str, max_results: int = 100, cache: dblp.ResponseCache | None = None
+) -> list:
     try:
-        results = dblp.search([query])
+        results = dblp.search([query], cache=cache)
         return results
     except Exception as e:
         logging.error(f"An error occurred while fetching papers: {e}")
@@ -18,26 +25,23 @@ def fetch_papers(query: str, max_results: int = 100) -> list:
 
 
 def generate_markdown(papers: list, filename: str = "papers.md") -> None:
+    """Merge the papers into the catalog and re-render papers.md from it."""
+    catalog = PaperCatalog()
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("# LLM for Security 相关文章\n\n")
-            f.write("| 标题 | 作者 | 年份 | 期刊/会议 | URL | DOI |\n")
-            f.write("| ---- | ---- | ---- | --------- | ---- | ---- |\n")
-            for paper in papers:
-                title = paper.get("title", "N/A")
-                authors = paper.get("authors", "N/A")
-                year = paper.get("year", "N/A")
-                venue = paper.get("venue", "N/A")
-                url = paper.get("url", "N/A")
-                doi = paper.get("doi", "N/A")
-                f.write(
-                    f"| {title} | {authors} | {year} | {venue} | [{url}]({url}) | [{doi}]({doi}) |\n"
-                )
+        catalog.upsert(papers, "dblp")
+        # Reconcile with Scholar records whose titles are spelt differently
+        catalog.dedupe()
+        catalog.render_markdown(filename)
     except Exception as e:
         logging.error(f"An error occurred while generating Markdown: {e}")
+    finally:
+        catalog.close()
 
 
 if __name__ == "__main__":
     query = "Large Language Models Security"
-    papers = fetch_papers(query)
+    cache = dblp.ResponseCache(DBLP_CACHE) if DBLP_CACHE else None
+    papers = fetch_papers(query, cache=cache)
+    if cache is not None:
+        logging.info(f"DBLP cache: {cache.stats()}")
     generate_markdown(papers)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+from tqdm import tqdm
+
+NUM_PERM = 128  # MinHash signature length
+BANDS = 16  # LSH bands of NUM_PERM // BANDS rows; catches pairs above ~0.7
+THRESHOLD = 0.8  # Estimated Jaccard at which two documents are one paper
+SHINGLE_WORDS = 5
+MAX_BUCKET = 64  # Members of an LSH bucket compared all-pairs
+SEED = 20240101  # Fixed so signatures stay comparable across runs
+INDEX_NAME = "near_duplicates.npz"
+GROUPS_NAME = "duplicates.json"
+
+_WORD = re.compile(r"[0-9a-z]+")
+_rng = np.random.default_rng(SEED)
+# Permutations x -> a * x + b (mod 2**32) of the 32-bit shingle hashes, a odd
+_A = _rng.integers(1, 2**32, NUM_PERM, dtype=np.uint32) | np.uint32(1)
+_B = _rng.integers(0, 2**32, NUM_PERM, dtype=np.uint32)
+_POWERS = np.uint64(0x100000001B3) ** np.arange(SHINGLE_WORDS, dtype=np.uint64)
+_word_hashes: dict[str, int] = {}  # Corpus vocabulary is small, memoize
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """Distinct 32-bit hashes of the word 5-grams of a document."""
+    words = _WORD.findall(text.casefold())
+    for word in set(words).difference(_word_hashes):
+        _word_hashes[word] = zlib.crc32(word.encode())
+    tokens = np.fromiter(
+        map(_word_hashes.__getitem__, words), dtype=np.uint64, count=len(words)
+    )
+    if len(tokens) < SHINGLE_WORDS:
+        tokens = np.pad(tokens, (0, SHINGLE_WORDS - len(tokens)))
+    windows = np.lib.stride_tricks.sliding_window_view(tokens, SHINGLE_WORDS)
+    hashes = windows @ _POWERS
+    return np.unique(
+        (hashes >> np.uint64(32)).astype(np.uint32) ^ hashes.astype(np.uint32)
+    )
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of a document, NUM_PERM uint32 values."""
+    hashes = shingle_hashes(text)
+    # One permutation at a time: a vector that fits in cache beats a
+    # shingles x permutations matrix several times over
+    return np.array([(hashes * a + b).min() for a, b in zip(_A, _B)], dtype=np.uint32)
+
+
+class NearDuplicateIndex:
+    """MinHash signatures of the extracted papers, with LSH grouping.
+
+    Signatures are kept in ``near_duplicates.npz`` next to the markdown,
+    keyed by file name and content hash, so re-indexing only hashes new or
+    changed files. ``groups()`` buckets signatures by LSH band and confirms
+    candidates by estimated Jaccard similarity.
+    """
+
+    def __init__(self, markdown_dir: str = "markdown/pypdf"):
+        self.markdown_dir = Path(markdown_dir)
+        self.index_path = self.markdown_dir / INDEX_NAME
+        self.names: list[str] = []
+        self.digests: list[str] = []
+        self.sizes: list[int] = []
+        self.signatures = np.empty((0, NUM_PERM), dtype=np.uint32)
+        if self.index_path.exists():
+            data = np.load(self.index_path)
+            self.names = data["names"].tolist()
+            self.digests = data["digests"].tolist()
+            self.sizes = data["sizes"].tolist()
+            self.signatures = data["signatures"]
+
+    def update(self) -> int:
+        """Index new and changed files, forget removed ones; returns files hashed."""
+        known = {name: i for i, name in enumerate(self.names)}
+        names, digests, sizes, signatures = [], [], [], []
+        hashed = 0
+        files = sorted(self.markdown_dir.glob("*.md"))
+        for path in tqdm(files, desc="Indexing near-duplicates"):
+            text = path.read_text(encoding="utf-8")
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            i = known.get(path.name)
+            if i is not None and self.digests[i] == digest:
+                signature = self.signatures[i]
+            else:
+                signature = minhash(text)
+                hashed += 1
+            names.append(path.name)
+            digests.append(digest)
+            sizes.append(len(text))
+            signatures.append(signature)
+
+        self.names, self.digests, self.sizes = names, digests, sizes
+        self.signatures = np.stack(signatures) if signatures else self.signatures[:0]
+        np.savez(
+            self.index_path,
+            names=np.array(self.names, dtype=str),
+            digests=np.array(self.digests, dtype=str),
+            sizes=np.array(self.sizes, dtype=np.int64),
+            signatures=self.signatures,
+        )
+        return hashed
+
+    def candidates(self):
+        """Yield arrays of documents that share at least one LSH band."""
+        rows = NUM_PERM // BANDS
+        band_type = np.dtype((np.void, rows * self.signatures.itemsize))
+        for band in range(BANDS):
+            keys = np.ascontiguousarray(
+                self.signatures[:, band * rows : (band + 1) * rows]
+            ).view(band_type)[:, 0]
+            _, inverse, counts = np.unique(
+                keys, return_inverse=True, return_counts=True
+            )
+            # Only documents whose bucket they share with another one
+            shared = np.flatnonzero(counts[inverse] > 1)
+            if not len(shared):
+                continue
+            shared = shared[np.argsort(inverse[shared], kind="stable")]
+            _, starts = np.unique(inverse[shared], return_index=True)
+            yield from np.split(shared, starts[1:])
+
+    def groups(self, threshold: float = THRESHOLD) -> dict[str, list[str]]:
+        """Canonical file name -> its near-duplicates.
+
+        The canonical copy is the longest text, taken to be the most complete
+        version (e.g. camera-ready with appendix over an earlier preprint).
+        """
+        parent = list(range(len(self.names)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for members in self.candidates():
+            # Estimated Jaccard: share of equal signature positions. Large
+            # buckets are only compared against their first member
+            signatures = self.signatures[members]
+            anchors = signatures if len(members) <= MAX_BUCKET else signatures[:1]
+            similar = (anchors[:, None, :] == signatures[None, :, :]).mean(axis=2)
+            for a, b in zip(*np.nonzero(similar >= threshold)):
+                if a != b:
+                    parent[find(int(members[a]))] = find(int(members[b]))
+
+        clusters: dict[int, list[int]] = {}
+        for i in range(len(self.names)):
+            clusters.setdefault(find(i), []).append(i)
+        groups = {}
+        for members in clusters.values():
+            if len(members) > 1:
+                members.sort(key=lambda i: (-self.sizes[i], self.names[i]))
+                groups[self.names[members[0]]] = [self.names[i] for i in members[1:]]
+        return groups
+
+    def duplicates(self, threshold: float = THRESHOLD) -> dict[str, str]:
+        """Near-duplicate file name -> canonical file name."""
+        return {
+            duplicate: canonical
+            for canonical, duplicates in self.groups(threshold).items()
+            for duplicate in duplicates
+        }
+
+
+def main():
+    index = NearDuplicateIndex()
+    hashed = index.update()
+    groups = index.groups()
+    with open(index.markdown_dir / GROUPS_NAME, "w", encoding="utf-8") as f:
+        json.dump(groups, f, indent=2, ensure_ascii=False)
+    duplicates = sum(len(d) for d in groups.values())
+    print(
+        f"Indexed {len(index.names)} files ({hashed} new or changed): "
+        f"{duplicates} near-duplicates in {len(groups)} groups"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import combinations
+from pathlib import Path
+
+CATALOG_PATH = "papers.sqlite3"
+MARKDOWN_PATH = "papers.md"
+MARKDOWN_TITLE = "# LLM for Security 相关文章"
+MISSING = {"", "N/A", "None"}  # Placeholders the collectors write for no value
+TITLE_SIMILARITY = 0.8  # Trigram Jaccard above which titles are one paper
+BLOCK_TOKENS = 3  # Rarest title words, paired up into blocking keys
+MAX_BLOCK = 200  # Larger blocks are too common a word to say anything
+# Which collector's value wins when duplicates are merged; the rest fall
+# back to the oldest record that has one
+PREFERRED_SOURCE = {
+    "title": "dblp",
+    "authors": "dblp",
+    "year": "dblp",
+    "venue": "dblp",
+    "doi": "dblp",
+    "url": "scholar",
+    "abstract": "scholar",
+}
+KEY_VERSION = 1  # Bumped when normalize_title() changes; older keys are rebuilt
+# Columns added after the catalog was introduced; created on open if missing
+ADDED_COLUMNS = {
+    "abstract": "TEXT",  # Search-result snippet, where the collector has one
+    "relevance": "REAL",  # Topic score from triage_papers.py
+    "relevant": "INTEGER",  # NULL until triaged
+    "judged_by": "TEXT",  # "score", or "llm" for a borderline tie-break
+}
+
+_NON_WORD = re.compile(r"[\W_]+")  # Unicode-aware, keeps CJK and Cyrillic letters
+LINK = re.compile(r"^\[.*?\]\((.*?)\)$")
+UNESCAPED_PIPE = re.compile(r"\s*(?<!\\)\|\s*")
+# papers.md column headers, as written by the collectors and render_markdown()
+HEADER_KEYS = {
+    "标题": "title",
+    "作者": "authors",
+    "年份": "year",
+    "期刊/会议": "venue",
+    "引用次数": "citations",
+    "链接": "url",
+    "URL": "url",
+    "DOI": "doi",
+}
+
+
+def normalize_title(title):
+    return _NON_WORD.sub(" ", unicodedata.normalize("NFKC", title).casefold()).strip()
+
+
+def candidate_pairs(papers):
+    """Pairs of papers that might be the same, without comparing all pairs.
+
+    Papers sharing a DOI are candidates, and so are papers sharing any two
+    of their BLOCK_TOKENS rarest title words. A fuzzy duplicate with one
+    misspelt or inflected word still shares a pair, while common words
+    would put everything in one block.
+    """
+    tokens = {paper["id"]: set(paper["norm_title"].split()) for paper in papers}
+    frequency = Counter(token for words in tokens.values() for token in words)
+    blocks = defaultdict(list)
+    for paper in papers:
+        if paper["doi"]:
+            blocks["doi:" + paper["doi"]].append(paper["id"])
+        rare = sorted(tokens[paper["id"]], key=lambda t: (frequency[t], t))
+        rare = sorted(rare[:BLOCK_TOKENS])
+        for key in combinations(rare, 2) if len(rare) > 1 else [tuple(rare)]:
+            blocks[key].append(paper["id"])
+
+    pairs = set()
+    for key, ids in blocks.items():
+        if len(ids) > 1 and (isinstance(key, str) or len(ids) <= MAX_BLOCK):
+            pairs.update(combinations(ids, 2))
+    return pairs
+
+
+def shingles(title):
+    """Character trigrams of a normalized title."""
+    return {title[i : i + 3] for i in range(max(len(title) - 2, 1))}
+
+
+def is_same_paper(a, b, threshold=TITLE_SIMILARITY):
+    if a["doi"] and b["doi"]:
+        return a["doi"] == b["doi"]
+    # Preprint and published versions may be a year apart, not more
+    if a["year"] and b["year"] and a["year"].isdigit() and b["year"].isdigit():
+        if abs(int(a["year"]) - int(b["year"])) > 1:
+            return False
+    x = a.get("shingles") or a.setdefault("shingles", shingles(a["norm_title"]))
+    y = b.get("shingles") or b.setdefault("shingles", shingles(b["norm_title"]))
+    # The size ratio bounds the Jaccard similarity, skip the set operations
+    if min(len(x), len(y)) < threshold * max(len(x), len(y)):
+        return False
+    return len(x & y) >= threshold * len(x | y)
+
+
+def _prefer(field):
+    """SQL for an upsert's ``field``, applying PREFERRED_SOURCE like _merge.
+
+    The new value wins if it comes from the field's preferred collector and
+    the stored record was not reported by that collector yet; otherwise the
+    stored value is kept when it has one.
+    """
+    preferred = PREFERRED_SOURCE[field]
+    return (
+        f"CASE WHEN json_extract(excluded.sources, '$[0]') = '{preferred}' "
+        f"AND NOT EXISTS (SELECT 1 FROM json_each(sources) "
+        f"WHERE value = '{preferred}') "
+        f"THEN COALESCE(excluded.{field}, {field}) "
+        f"ELSE COALESCE({field}, excluded.{field}) END"
+    )
+
+
+def _clean(value):
+    return None if value is None or str(value).strip() in MISSING else value
+
+
+def _cell(value):
+    """Render a value as a markdown table cell, escaping pipes."""
+    return str(value).replace("|", "\\|").replace("\n", " ") if value else "N/A"
+
+
+class PaperCatalog:
+    """SQLite catalog of collected papers, shared by every pipeline stage.
+
+    Collectors upsert into it as they find papers and the downloader queries
+    it, so no stage has to re-parse papers.md, which is rendered from the
+    catalog as a read-only view. Papers are keyed on their normalized title;
+    a later record fills in the fields an earlier one was missing.
+    """
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS papers ("
+            "id INTEGER PRIMARY KEY, norm_title TEXT NOT NULL UNIQUE, "
+            "title TEXT NOT NULL, authors TEXT, year TEXT, venue TEXT, "
+            "citations INTEGER, url TEXT, doi TEXT, sources TEXT NOT NULL, "
+            "added REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        columns = {
+            row["name"] for row in self.conn.execute("PRAGMA table_info(papers)")
+        }
+        for column, kind in ADDED_COLUMNS.items():
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE papers ADD COLUMN {column} {kind}")
+        for column in ("doi", "url", "year"):
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS papers_{column} ON papers ({column})"
+            )
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION:
+            self._rekey()
+        self.conn.commit()
+
+    def _rekey(self):
+        """Recompute norm_title after normalize_title() changed.
+
+        Catalogs written before version 1 dropped every non-ASCII letter;
+        records whose new key is taken already stay under the old one for
+        dedupe() to merge.
+        """
+        rows = self.conn.execute("SELECT id, title FROM papers").fetchall()
+        for row in rows:
+            key = normalize_title(row["title"])
+            if key:
+                self.conn.execute(
+                    "UPDATE OR IGNORE papers SET norm_title = ? WHERE id = ?",
+                    (key, row["id"]),
+                )
+        self.conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+
+    def _row(self, paper, source, now):
+        title = _clean(paper.get("title"))
+        # Punctuation-only titles would all share the empty key, skip them
+        if not title or not normalize_title(title):
+            return None
+        authors = _clean(paper.get("authors"))
+        if isinstance(authors, str):
+            authors = [a.strip() for a in authors.split(",") if a.strip()]
+        year = _clean(paper.get("year"))
+        citations = _clean(paper.get("citations"))
+        doi = _clean(paper.get("doi"))
+        return (
+            normalize_title(title),
+            title,
+            json.dumps(authors, ensure_ascii=False) if authors else None,
+            str(year) if year else None,
+            _clean(paper.get("venue")),
+            int(citations) if str(citations or "").isdigit() else None,
+            _clean(paper.get("url") or paper.get("link")),
+            doi.lower() if doi else None,
+            _clean(paper.get("abstract")),
+            json.dumps([source]),
+            now,
+            now,
+        )
+
+    def upsert(self, papers, source):
+        """Insert or merge papers from one collector; returns rows written."""
+        now = time.time()
+        rows = [row for paper in papers if (row := self._row(paper, source, now))]
+        self.conn.executemany(
+            "INSERT INTO papers (norm_title, title, authors, year, venue, citations, "
+            "url, doi, abstract, sources, added, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (norm_title) DO UPDATE SET "
+            + "".join(f"{field} = {_prefer(field)}, " for field in PREFERRED_SOURCE)
+            + "citations = COALESCE(MAX(citations, excluded.citations), citations, "
+            "excluded.citations), "
+            "sources = CASE WHEN EXISTS (SELECT 1 FROM json_each(sources) "
+            "WHERE value = json_extract(excluded.sources, '$[0]')) THEN sources "
+            "ELSE json_insert(sources, '$[#]', json_extract(excluded.sources, '$[0]')) END, "
+            "updated = excluded.updated",
+            rows,
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def _paper(self, row):
+        paper = dict(row)
+        paper["authors"] = json.loads(paper["authors"]) if paper["authors"] else []
+        paper["sources"] = json.loads(paper["sources"])
+        return paper
+
+    def papers(self, year=None, with_url=False, source=None, relevant=None):
+        """Iterate over catalog entries, optionally filtered.
+
+        ``relevant=True`` leaves out papers that triage ruled off-topic;
+        papers not triaged yet are kept.
+        """
+        clauses, params = [], []
+        if year is not None:
+            clauses.append("year = ?")
+            params.append(str(year))
+        if with_url:
+            clauses.append("url IS NOT NULL")
+        if source is not None:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(sources) WHERE value = ?)")
+            params.append(source)
+        if relevant is not None:
+            clauses.append("COALESCE(relevant, 1) = ?")
+            params.append(int(relevant))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        for row in self.conn.execute(
+            f"SELECT * FROM papers{where} ORDER BY id", params
+        ):
+            yield self._paper(row)
+
+    def get(self, title=None, doi=None, url=None):
+        if doi:
+            row = self.conn.execute(
+                "SELECT * FROM papers WHERE doi = ?", (doi.lower(),)
+            ).fetchone()
+        elif url:
+            row = self.conn.execute(
+                "SELECT * FROM papers WHERE url = ?", (url,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT * FROM papers WHERE norm_title = ?", (normalize_title(title),)
+            ).fetchone()
+        return self._paper(row) if row else None
+
+    def dedupe(self, threshold=TITLE_SIMILARITY):
+        """Merge records of the same paper that differ in title spelling.
+
+        Candidates come from candidate_pairs() and are confirmed by title
+        similarity, so this stays near-linear in the catalog size. Each group
+        is merged into its oldest record, taking each field from the
+        PREFERRED_SOURCE where one reported it. Returns the records removed.
+        """
+        # Only the matching fields; full records are read for merged groups
+        papers = {
+            row["id"]: dict(row)
+            for row in self.conn.execute("SELECT id, norm_title, doi, year FROM papers")
+        }
+        parent = {}
+
+        def find(i):
+            while parent.get(i, i) != i:
+                parent[i] = parent.get(parent[i], parent[i])  # Path halving
+                i = parent[i]
+            return i
+
+        for i, j in candidate_pairs(list(papers.values())):
+            if find(i) != find(j) and is_same_paper(papers[i], papers[j], threshold):
+                parent[max(find(i), find(j))] = min(find(i), find(j))
+
+        groups = defaultdict(list)
+        for i in parent:
+            groups[find(i)].append(i)
+        for keep, duplicates in groups.items():
+            self._merge([self._get_id(i) for i in [keep] + duplicates])
+        self.conn.commit()
+        return sum(len(members) for members in groups.values())
+
+    def _merge(self, members):
+        """Fold duplicate records into the first one and delete the rest."""
+        merged = {}
+        for field in ("title", "authors", "year", "venue", "url", "doi", "abstract"):
+            preferred = PREFERRED_SOURCE[field]
+            ranked = sorted(members, key=lambda m: preferred not in m["sources"])
+            merged[field] = next((m[field] for m in ranked if m[field]), None)
+        citations = [m["citations"] for m in members if m["citations"] is not None]
+        sources = list(dict.fromkeys(s for m in members for s in m["sources"]))
+
+        duplicates = [m["id"] for m in members[1:]]
+        self.conn.executemany(
+            "DELETE FROM papers WHERE id = ?", [(i,) for i in duplicates]
+        )
+        self.conn.execute(
+            "UPDATE papers SET norm_title = ?, title = ?, authors = ?, year = ?, "
+            "venue = ?, citations = ?, url = ?, doi = ?, abstract = ?, sources = ?, "
+            "updated = ? "
+            "WHERE id = ?",
+            (
+                normalize_title(merged["title"]),
+                merged["title"],
+                (
+                    json.dumps(merged["authors"], ensure_ascii=False)
+                    if merged["authors"]
+                    else None
+                ),
+                merged["year"],
+                merged["venue"],
+                max(citations) if citations else None,
+                merged["url"],
+                merged["doi"],
+                merged["abstract"],
+                json.dumps(sources),
+                time.time(),
+                members[0]["id"],
+            ),
+        )
+
+    def set_relevance(self, verdicts):
+        """Record triage results: (id, relevance, relevant, judged_by) tuples."""
+        self.conn.executemany(
+            "UPDATE papers SET relevance = ?, relevant = ?, judged_by = ? WHERE id = ?",
+            [
+                (relevance, int(relevant), judged_by, paper_id)
+                for paper_id, relevance, relevant, judged_by in verdicts
+            ],
+        )
+        self.conn.commit()
+
+    def _get_id(self, paper_id):
+        row = self.conn.execute("SELECT * FROM papers WHERE id = ?", (paper_id,))
+        return self._paper(row.fetchone())
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def render_markdown(self, path=MARKDOWN_PATH, title=MARKDOWN_TITLE):
+        """Write papers.md from the catalog; the catalog stays the source of truth."""
+        tmp_path = Path(path).with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{title}\n\n")
+            f.write("| 标题 | 作者 | 年份 | 期刊/会议 | 引用次数 | 链接 |\n")
+            f.write("| ---- | ---- | ---- | --------- | -------- | ---- |\n")
+            for paper in self.papers():
+                link = f"[Link]({paper['url']})" if paper["url"] else "N/A"
+                f.write(
+                    f"| {_cell(paper['title'])} | {_cell(', '.join(paper['authors']))} | "
+                    f"{_cell(paper['year'])} | {_cell(paper['venue'])} | "
+                    f"{_cell(paper['citations'])} | {link} |\n"
+                )
+        tmp_path.replace(path)
+
+    def import_markdown(self, path=MARKDOWN_PATH, source="papers.md"):
+        """Import a papers.md, e.g. one written before the catalog existed.
+
+        Columns are read from the table header, so this understands the
+        tables of both collectors, Scholar (title, authors, year, citations,
+        link) and DBLP (title, authors, year, venue, URL, DOI), as well as
+        the one render_markdown() writes.
+        """
+        papers = []
+        keys = None
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.startswith("|"):
+                    continue
+                cells = [
+                    c.strip().replace("\\|", "|")
+                    for c in UNESCAPED_PIPE.split(line.strip().strip("|"))
+                ]
+                if cells[0] in HEADER_KEYS:
+                    keys = [HEADER_KEYS.get(c) for c in cells]
+                    continue
+                if keys is None or set(cells[0]) <= set("-: "):
+                    continue
+                # Titles written before pipes were escaped may contain them,
+                # so count the other fields from the end
+                extra = max(len(cells) - len(keys), 0)
+                cells[: extra + 1] = [" | ".join(cells[: extra + 1])]
+                values = [m.group(1) if (m := LINK.match(c)) else c for c in cells]
+                paper = {key: value for key, value in zip(keys, values) if key}
+                papers.append(paper)
+        return self.upsert(papers, source)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,294 @@
+import argparse
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from tqdm import tqdm
+
+INDEX_PATH = "search_index.npz"
+K1 = 1.2  # BM25 term-frequency saturation
+B = 0.75  # BM25 length normalization
+SNIPPET_CHARS = 240
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was we were which with our these their can not".split()
+)
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+KINDS = ("markdown", "summary")
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        t for t in _TOKEN.findall(text.casefold()) if len(t) > 1 and t not in STOPWORDS
+    ]
+
+
+def read_title(path: Path) -> str:
+    """First non-empty line of a file, without markdown heading marks."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line := line.strip().strip("#").strip():
+                return line
+    return path.stem
+
+
+class SearchIndex:
+    """BM25 inverted index over extracted papers and their summaries.
+
+    Postings are kept as CSR-style arrays (per term: a slice of document
+    ids and term frequencies) in one uncompressed ``.npz``, so loading is a
+    few array reads and a query only touches the postings of its terms.
+    ``update()`` re-tokenizes only files whose size or mtime changed.
+    A paper's score is the sum of its markdown and summary scores.
+    """
+
+    def __init__(
+        self,
+        markdown_dir: str = "markdown/pypdf",
+        summaries_dir: str = "summaries",
+        index_path: str = INDEX_PATH,
+    ):
+        self.markdown_dir = Path(markdown_dir)
+        self.summaries_dir = Path(summaries_dir)
+        self.index_path = Path(index_path)
+        self.paths = np.array([], dtype=str)  # Per document
+        self.kinds = np.array([], dtype=np.int8)
+        self.papers = np.array([], dtype=str)
+        self.titles = np.array([], dtype=str)
+        self.stamps = np.zeros((0, 2), dtype=np.int64)  # mtime_ns, size
+        self.lengths = np.array([], dtype=np.int32)
+        self.vocabulary = np.array([], dtype=str)  # Sorted terms
+        self.indptr = np.zeros(1, dtype=np.int64)  # Per term, into the postings
+        self.doc_ids = np.array([], dtype=np.int32)
+        self.tfs = np.array([], dtype=np.uint16)
+        if self.index_path.exists():
+            with np.load(self.index_path) as data:
+                for name in data.files:
+                    setattr(self, name, data[name])
+        self._derived = None
+
+    def sources(self) -> list[tuple[Path, int, str]]:
+        """Files to index: (path, kind, paper key)."""
+        files = [(p, 0, p.stem) for p in sorted(self.markdown_dir.glob("*.md"))]
+        files += [
+            (p, 1, p.stem.removesuffix("_summary"))
+            for p in sorted(self.summaries_dir.glob("*_summary.md"))
+        ]
+        return files
+
+    def update(self) -> int:
+        """Bring the index in line with the files on disk; returns files read."""
+        known = {path: i for i, path in enumerate(self.paths.tolist())}
+        keep, new = [], []
+        for path, kind, paper in self.sources():
+            stat = path.stat()
+            i = known.get(str(path))
+            if i is not None and tuple(self.stamps[i]) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                keep.append(i)
+            else:
+                new.append((path, kind, paper, (stat.st_mtime_ns, stat.st_size)))
+        if not new and len(keep) == len(self.paths):
+            return 0
+
+        # Postings of unchanged documents, renumbered to their new positions
+        remap = np.full(len(self.paths), -1, dtype=np.int32)
+        remap[keep] = np.arange(len(keep), dtype=np.int32)
+        old_terms = np.repeat(np.arange(len(self.vocabulary)), np.diff(self.indptr))
+        kept = remap[self.doc_ids] >= 0
+        old_terms, old_docs, old_tfs = (
+            old_terms[kept],
+            remap[self.doc_ids[kept]],
+            self.tfs[kept],
+        )
+        terms, doc_ids, tfs = [], [], []
+
+        paths = self.paths[keep].tolist()
+        kinds = self.kinds[keep].tolist()
+        papers = self.papers[keep].tolist()
+        titles = self.titles[keep].tolist()
+        stamps = self.stamps[keep].tolist()
+        lengths = self.lengths[keep].tolist()
+        for path, kind, paper, stamp in tqdm(new, desc="Indexing"):
+            text = path.read_text(encoding="utf-8")
+            counts = Counter(tokenize(text))
+            doc_id = len(paths)
+            paths.append(str(path))
+            kinds.append(kind)
+            papers.append(paper)
+            titles.append(read_title(path))
+            stamps.append(stamp)
+            lengths.append(sum(counts.values()))
+            terms.append(np.array(list(counts), dtype=str))
+            doc_ids.append(np.full(len(counts), doc_id, dtype=np.int32))
+            tfs.append(np.fromiter(counts.values(), dtype=np.int64, count=len(counts)))
+
+        # Merge the new terms into the sorted vocabulary; the old postings
+        # stay grouped by term, so only the small new part needs sorting
+        new_terms = np.concatenate(terms) if terms else np.array([], dtype=str)
+        vocabulary = np.union1d(self.vocabulary, new_terms)
+        term_ids = np.concatenate(
+            [
+                np.searchsorted(vocabulary, self.vocabulary)[old_terms],
+                np.searchsorted(vocabulary, new_terms),
+            ]
+        )
+        order = np.argsort(term_ids, kind="stable")
+        term_ids = term_ids[order]
+        self.doc_ids = np.concatenate([old_docs, *doc_ids])[order].astype(np.int32)
+        tfs = np.concatenate([old_tfs, *tfs])[order]
+        self.tfs = np.minimum(tfs, 65535).astype(np.uint16)
+        self.vocabulary = vocabulary
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(term_ids, minlength=len(self.vocabulary)), out=self.indptr[1:]
+        )
+
+        self.paths = np.array(paths, dtype=str)
+        self.kinds = np.array(kinds, dtype=np.int8)
+        self.papers = np.array(papers, dtype=str)
+        self.titles = np.array(titles, dtype=str)
+        self.stamps = np.array(stamps, dtype=np.int64).reshape(-1, 2)
+        self.lengths = np.array(lengths, dtype=np.int32)
+        self._derived = None
+        self.save()
+        return len(new)
+
+    def save(self):
+        # Write through a file object so numpy keeps the temporary name
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                paths=self.paths,
+                kinds=self.kinds,
+                papers=self.papers,
+                titles=self.titles,
+                stamps=self.stamps,
+                lengths=self.lengths,
+                vocabulary=self.vocabulary,
+                indptr=self.indptr,
+                doc_ids=self.doc_ids,
+                tfs=self.tfs,
+            )
+        tmp_path.replace(self.index_path)
+
+    def derived(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-query constants, computed once per loaded index."""
+        if self._derived is None:
+            # Length normalization against the average of the same kind of file
+            average = np.ones(len(KINDS))
+            for k in range(len(KINDS)):
+                if (self.kinds == k).any():
+                    average[k] = self.lengths[self.kinds == k].mean()
+            norm = K1 * (1 - B + B * self.lengths / average[self.kinds])
+            names, paper_ids = np.unique(self.papers, return_inverse=True)
+            self._derived = norm.astype(np.float32), names, paper_ids
+        return self._derived
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for the query."""
+        scores = np.zeros(len(self.paths), dtype=np.float32)
+        norm, _, _ = self.derived()
+        for term in set(tokenize(query)):
+            t = np.searchsorted(self.vocabulary, term)
+            if t == len(self.vocabulary) or self.vocabulary[t] != term:
+                continue
+            start, stop = self.indptr[t], self.indptr[t + 1]
+            docs, tf = self.doc_ids[start:stop], self.tfs[start:stop].astype(np.float32)
+            idf = np.log1p((len(self.paths) - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tf * (K1 + 1) / (tf + norm[docs])
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """Top papers for the query, with a snippet from the best-matching file."""
+        scores = self.scores(query)
+        _, names, paper_ids = self.derived()
+        paper_scores = np.bincount(paper_ids, weights=scores, minlength=len(names))
+        top = np.flatnonzero(paper_scores > 0)
+        top = top[np.argsort(-paper_scores[top], kind="stable")][:limit]
+
+        results = []
+        for p in top:
+            docs = np.flatnonzero(paper_ids == p)
+            best = docs[np.argmax(scores[docs])]
+            # Prefer the summary's title, it is written for humans
+            titled = [d for d in docs if self.kinds[d] == 1] or [best]
+            results.append(
+                {
+                    "paper": str(names[p]),
+                    "score": float(paper_scores[p]),
+                    "title": str(self.titles[titled[0]]),
+                    "path": str(self.paths[best]),
+                    "snippet": snippet(Path(self.paths[best]), query),
+                }
+            )
+        return results
+
+    def summary_titles(self) -> list[tuple[str, str]]:
+        """(file name, title) of every indexed summary, sorted by file name."""
+        return sorted(
+            (Path(path).name, str(title))
+            for path, title, kind in zip(self.paths, self.titles, self.kinds)
+            if kind == 1
+        )
+
+
+def snippet(path: Path, query: str, width: int = SNIPPET_CHARS) -> str:
+    """The window of the file that contains the most distinct query terms."""
+    text = " ".join(path.read_text(encoding="utf-8").split())
+    terms = set(tokenize(query))
+    if not terms:
+        return text[:width]
+    pattern = re.compile(
+        r"\b(" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE
+    )
+    hits = [(m.start(), m.group().casefold()) for m in pattern.finditer(text)]
+    if not hits:
+        return text[:width]
+    best, best_count = hits[0][0], 0
+    for i, (start, _) in enumerate(hits):
+        seen = set()
+        for pos, term in hits[i:]:
+            if pos >= start + width:
+                break
+            seen.add(term)
+        if len(seen) > best_count:
+            best, best_count = start, len(seen)
+            if best_count == len(terms):
+                break
+    start = max(0, best - width // 4)
+    return ("..." if start else "") + text[start : start + width] + "..."
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search extracted papers and summaries"
+    )
+    parser.add_argument("query", nargs="?", help="search terms")
+    parser.add_argument("-k", "--limit", type=int, default=10, help="results to show")
+    parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="search the index as is, without re-scanning",
+    )
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    if not args.no_update:
+        if changed := index.update():
+            print(f"Indexed {changed} new or changed files")
+    if not args.query:
+        return
+    for rank, result in enumerate(index.search(args.query, args.limit), 1):
+        print(f"{rank}. {result['title']} ({result['score']:.2f})")
+        print(f"   {result['path']}")
+        print(f"   {result['snippet']}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,9 +34,13 @@ class PaperCollectionChain:
         chain_prompt = await self.prompt_manager.get_chain_prompt(self.search_template)
         return PromptTemplate(template=chain_prompt, input_variables=["topic"])
 
-    async def run(self, topic: str):
+    async def stream(self, topic: str, limit: int = None):
+        """Yield papers for ``topic`` as soon as Scholar returns them."""
         prompt = await self._get_prompt()
         chain = LLMChain(llm=self.llm, prompt=prompt)
         search_query = await chain.arun(topic=topic)
-        papers = await self.scholarly_client.search_papers(search_query)
-        return papers
+        async for paper in self.scholarly_client.iter_papers(search_query, limit):
+            yield paper
+
+    async def run(self, topic: str, limit: int = None):
+        return [paper async for paper in self.stream(topic, limit)]
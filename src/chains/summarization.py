@@ -1,5 +1,6 @@
 from langchain.chains.summarize import load_summarize_chain
 from langchain.prompts import PromptTemplate
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_anthropic import ChatAnthropic
 
 from ..config.settings import settings
@@ -29,11 +30,47 @@ class SummarizationChain:
         Paper content: {text}
         """
 
+        self.map_template = """
+        Below is one part of a longer research paper about LLMs and security.
+        Summarize this part, keeping its claims, methods, numbers and any
+        title or section names:
+
+        {text}
+        """
+
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=settings.CHUNK_TOKENS * settings.CHARS_PER_TOKEN,
+            chunk_overlap=0,
+            separators=["\n#", "\n\n", "\n", " "],
+        )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return len(text) // settings.CHARS_PER_TOKEN + 1
+
     async def _get_prompt(self) -> PromptTemplate:
         chain_prompt = await self.prompt_manager.get_chain_prompt(self.summary_template)
         return PromptTemplate(template=chain_prompt, input_variables=["text"])
 
     async def summarize(self, text: str):
         prompt = await self._get_prompt()
-        chain = load_summarize_chain(llm=self.llm, chain_type="stuff", prompt=prompt)
-        return await chain.arun(text)
+        if self.estimate_tokens(text) <= settings.STUFF_TOKEN_LIMIT:
+            chain = load_summarize_chain(
+                llm=self.llm, chain_type="stuff", prompt=prompt
+            )
+            return await chain.arun(text)
+
+        # Too long for one call: summarize the chunks concurrently, then
+        # combine the partial summaries with the usual structured prompt
+        map_prompt = PromptTemplate(
+            template=self.map_template, input_variables=["text"]
+        )
+        chain = load_summarize_chain(
+            llm=self.llm,
+            chain_type="map_reduce",
+            map_prompt=map_prompt,
+            combine_prompt=prompt,
+            token_max=settings.STUFF_TOKEN_LIMIT,
+        )
+        documents = self.splitter.create_documents([text])
+        return await chain.arun(documents)
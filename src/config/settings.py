@@ -20,6 +20,17 @@ class Settings(BaseSettings):
     MAX_TOKENS: int = 4096
     TEMPERATURE: float = 0.3
 
+    # Papers over this many (estimated) tokens are summarized map-reduce style
+    STUFF_TOKEN_LIMIT: int = 100_000
+    CHUNK_TOKENS: int = 30_000
+    CHARS_PER_TOKEN: int = 4
+
+    # Pipeline: concurrent workers per stage, stages linked by bounded queues
+    EXTRACTOR: str = "pypdf"
+    DOWNLOAD_WORKERS: int = 8
+    EXTRACTION_WORKERS: int = 2
+    SUMMARY_WORKERS: int = 4
+
     class Config:
         env_file = ".env"
 
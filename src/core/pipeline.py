@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Union
+
+_DONE = object()  # Sentinel telling a worker its input is exhausted
+
+
+class Stage:
+    """One pipeline step, run by ``workers`` concurrent tasks.
+
+    ``func`` receives an item from the previous stage and returns the item
+    for the next one, or None to drop it (e.g. a paper without a PDF).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        queue_size: int = 0,
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        # Bounded input queue: a slow stage blocks its producers instead of
+        # letting finished-but-unprocessed items pile up in memory
+        self.queue_size = queue_size or 2 * workers
+        self.stats = {"done": 0, "dropped": 0, "failed": 0, "busy": 0.0}
+
+
+class Pipeline:
+    """Stages connected by bounded queues, all running at the same time.
+
+    Each item moves on as soon as a stage finishes it, so the first paper
+    can be summarized while later ones are still being found or downloaded,
+    and the total wall time approaches that of the slowest stage.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+
+    async def _feed(self, source: Union[Iterable, AsyncIterable], queue: asyncio.Queue):
+        if hasattr(source, "__aiter__"):
+            async for item in source:
+                await queue.put(item)
+        else:
+            for item in source:
+                await queue.put(item)
+
+    async def _work(self, stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        while (item := await inbox.get()) is not _DONE:
+            start = time.perf_counter()
+            try:
+                result = await stage.func(item)
+            except Exception as e:
+                print(f"{stage.name} failed for {item!r}: {e}")
+                stage.stats["failed"] += 1
+                continue
+            finally:
+                stage.stats["busy"] += time.perf_counter() - start
+            if result is None:
+                stage.stats["dropped"] += 1
+            else:
+                stage.stats["done"] += 1
+                await outbox.put(result)
+
+    async def _run_stage(
+        self, stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue
+    ):
+        await asyncio.gather(
+            *(self._work(stage, inbox, outbox) for _ in range(stage.workers))
+        )
+
+    async def run(self, source: Union[Iterable, AsyncIterable]) -> List[Any]:
+        """Push every item of ``source`` through all stages.
+
+        Returns the items that came out of the last stage, in completion order.
+        """
+        queues = [asyncio.Queue(stage.queue_size) for stage in self.stages]
+        results: List[Any] = []
+        sink = _Sink(results)
+
+        async def feed():
+            try:
+                await self._feed(source, queues[0])
+            except Exception as e:
+                # Keep what was already found moving through the stages
+                print(f"source failed: {e}")
+            finally:
+                # Let the workers drain and exit even if the source failed
+                for _ in range(self.stages[0].workers):
+                    await queues[0].put(_DONE)
+
+        async def run_stage(i: int):
+            stage = self.stages[i]
+            outbox = queues[i + 1] if i + 1 < len(queues) else sink
+            await self._run_stage(stage, queues[i], outbox)
+            # Only close the next stage once every worker of this one is done
+            if i + 1 < len(queues):
+                for _ in range(self.stages[i + 1].workers):
+                    await queues[i + 1].put(_DONE)
+
+        await asyncio.gather(feed(), *(run_stage(i) for i in range(len(self.stages))))
+        return results
+
+    def report(self) -> Dict[str, Dict]:
+        return {stage.name: dict(stage.stats) for stage in self.stages}
+
+
+class _Sink:
+    """Queue-like collector for the output of the last stage."""
+
+    def __init__(self, results: List[Any]):
+        self.results = results
+
+    async def put(self, item: Any):
+        self.results.append(item)
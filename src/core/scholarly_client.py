@@ -1,34 +1,44 @@
-import asyncio
-from typing import Dict, List
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List
 
 from langchain.tools import Tool
 from scholarly import scholarly
 
+from .threaded_iter import PREFETCH, iterate_in_thread
+
 
 class ScholarlyClient:
     @staticmethod
-    async def search_papers(query: str, limit: int = None) -> List[Dict]:
-        search_query = scholarly.search_pubs(query)
-        papers = []
-
-        while True:
-            try:
-                pub = next(search_query)
-                paper = {
-                    "title": pub.bib.get("title", "N/A"),
-                    "authors": pub.bib.get("author", ["N/A"]),
-                    "year": pub.bib.get("pub_year", "N/A"),
-                    "citations": pub.get("num_citations", "N/A"),
-                    "url": pub.get("pub_url") or pub.get("eprint_url", "N/A"),
-                }
-                papers.append(paper)
-
-                if limit and len(papers) >= limit:
+    def _to_paper(pub) -> Dict:
+        return {
+            "title": pub["bib"].get("title", "N/A"),
+            "authors": pub["bib"].get("author", ["N/A"]),
+            "year": pub["bib"].get("pub_year", "N/A"),
+            "citations": pub.get("num_citations", "N/A"),
+            "url": pub.get("pub_url") or pub.get("eprint_url", "N/A"),
+        }
+
+    @staticmethod
+    async def iter_papers(
+        query: str, limit: int = None, prefetch: int = PREFETCH
+    ) -> AsyncIterator[Dict]:
+        """Yield papers as Scholar returns them, fetching pages in a thread.
+
+        Each call has its own thread, so several queries can be consumed
+        concurrently.
+        """
+        count = 0
+        pubs = iterate_in_thread(lambda: scholarly.search_pubs(query), prefetch)
+        async with aclosing(pubs):
+            async for pub in pubs:
+                yield ScholarlyClient._to_paper(pub)
+                count += 1
+                if limit and count >= limit:
                     break
-            except StopIteration:
-                break
 
-        return papers
+    @staticmethod
+    async def search_papers(query: str, limit: int = None) -> List[Dict]:
+        return [paper async for paper in ScholarlyClient.iter_papers(query, limit)]
 
     def get_tool(self) -> Tool:
         return Tool(
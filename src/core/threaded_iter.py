@@ -0,0 +1,48 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Iterator
+
+PREFETCH = 10  # Results fetched ahead of the consumer
+_END = object()
+
+
+async def iterate_in_thread(
+    make_iterator: Callable[[], Iterator], prefetch: int = PREFETCH
+) -> AsyncIterator:
+    """Consume a blocking iterator from a worker thread without blocking the loop.
+
+    The thread runs at most ``prefetch`` items ahead, then waits for the
+    consumer. Errors raised by the iterator are re-raised here. Stopping
+    early (break, limit, cancellation) releases the thread after the
+    request it is currently waiting on.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(prefetch)
+    stop = threading.Event()
+
+    def put(item) -> None:
+        if not stop.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce():
+        try:
+            for item in make_iterator():
+                if stop.is_set():
+                    return
+                put(item)
+            put(_END)
+        except Exception as e:
+            put(e)
+
+    # A daemon thread, so an abandoned search cannot hold up interpreter exit
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while (item := await queue.get()) is not _END:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting for room in the queue
+        while not queue.empty():
+            queue.get_nowait()
@@ -0,0 +1,28 @@
+from .base import (
+    EXTRACTORS,
+    BaseExtractor,
+    PageExtractor,
+    RangeExtractor,
+    get_extractor,
+    register_extractor,
+    save_markdown,
+)
+from .cascade import CascadeExtractor, cascade_pages
+from .nougat import NougatExtractor
+from .pypdf import PyPDFExtractor
+from .quality import score_page
+
+__all__ = [
+    "EXTRACTORS",
+    "BaseExtractor",
+    "CascadeExtractor",
+    "NougatExtractor",
+    "PageExtractor",
+    "PyPDFExtractor",
+    "RangeExtractor",
+    "cascade_pages",
+    "get_extractor",
+    "register_extractor",
+    "save_markdown",
+    "score_page",
+]
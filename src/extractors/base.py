@@ -1,13 +1,108 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+import aiofiles
+
+
+async def save_markdown(content: str, output_path: Path) -> bool:
+    """Save extracted text as markdown. Returns True if successful."""
+    try:
+        # Skip empty or whitespace-only content
+        if not content or not content.strip():
+            return False
+
+        async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
+            await f.write(content)
+        return True
+    except Exception as e:
+        print(f"Error saving markdown to {output_path}: {e}")
+        return False
+
+
+def contiguous_ranges(pages: List[int], gap: int = 0) -> List[Tuple[int, int]]:
+    """Group 0-based page numbers into sorted, inclusive (first, last) runs.
+
+    Runs at most ``gap`` pages apart are joined, gap pages included.
+    """
+    ranges = []
+    for page in sorted(set(pages)):
+        if ranges and page <= ranges[-1][1] + 1 + gap:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    return ranges
 
 
 class BaseExtractor(ABC):
+    name: str = ""
+
     @abstractmethod
     async def extract_text(self, pdf_path: Path) -> Optional[str]:
         pass
 
-    @abstractmethod
     async def save_markdown(self, content: str, output_path: Path) -> bool:
-        pass
+        return await save_markdown(content, output_path)
+
+
+class RangeExtractor(BaseExtractor):
+    """Extractor that can re-read selected runs of pages.
+
+    Its output cannot necessarily be split back into single pages, so it
+    is returned per contiguous run. Usable as the OCR side of a cascade.
+    """
+
+    @abstractmethod
+    async def extract_ranges(
+        self, pdf_path: Path, pages: List[int]
+    ) -> Dict[Tuple[int, int], str]:
+        """Text of each contiguous run (first, last) of the given 0-based pages."""
+
+
+class PageExtractor(RangeExtractor):
+    """Extractor that reads single pages; usable on either side of a cascade."""
+
+    @abstractmethod
+    async def extract_pages(
+        self, pdf_path: Path, pages: Optional[List[int]] = None
+    ) -> List[str]:
+        """Extract the given 0-based pages (all if None), one string per page."""
+
+    async def extract_ranges(
+        self, pdf_path: Path, pages: List[int]
+    ) -> Dict[Tuple[int, int], str]:
+        ranges = contiguous_ranges(pages)
+        texts = iter(
+            await self.extract_pages(
+                pdf_path, [p for a, b in ranges for p in range(a, b + 1)]
+            )
+        )
+        return {
+            (first, last): "\n\n".join(next(texts) for _ in range(first, last + 1))
+            for first, last in ranges
+        }
+
+
+EXTRACTORS: Dict[str, Type[BaseExtractor]] = {}
+
+
+def register_extractor(
+    name: str,
+) -> Callable[[Type[BaseExtractor]], Type[BaseExtractor]]:
+    """Class decorator making an extractor available under ``name``."""
+
+    def decorator(cls: Type[BaseExtractor]) -> Type[BaseExtractor]:
+        cls.name = name
+        EXTRACTORS[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_extractor(name: str, **kwargs) -> BaseExtractor:
+    try:
+        return EXTRACTORS[name](**kwargs)
+    except KeyError:
+        raise ValueError(
+            f"Unknown extractor {name!r}, available: {sorted(EXTRACTORS)}"
+        ) from None
@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .base import (
+    BaseExtractor,
+    PageExtractor,
+    RangeExtractor,
+    get_extractor,
+    register_extractor,
+)
+from .quality import score_page
+
+QUALITY_THRESHOLD = 0.6
+
+
+async def cascade_pages(
+    texts: List[str],
+    ocr: RangeExtractor,
+    pdf_path: Path,
+    threshold: float = QUALITY_THRESHOLD,
+) -> List[str]:
+    """Redo the pages of ``texts`` that score below ``threshold`` with ``ocr``.
+
+    ``texts`` holds the fast text of every page of the PDF. OCR output comes
+    per contiguous run of failing pages, so it replaces the run's first page
+    and the rest of the run is emptied. If OCR fails, the fast text is kept.
+    """
+    failing = [i for i, text in enumerate(texts) if score_page(text) < threshold]
+    if not failing:
+        return texts
+    texts = list(texts)
+    try:
+        runs = await ocr.extract_ranges(pdf_path, failing)
+    except Exception as e:
+        print(f"OCR fallback failed for {pdf_path}, keeping fast text: {e}")
+        return texts
+    for (first, last), text in runs.items():
+        texts[first : last + 1] = [text] + [""] * (last - first)
+    return texts
+
+
+@register_extractor("cascade")
+class CascadeExtractor(BaseExtractor):
+    """Fast extractor first, expensive OCR only for the pages it fails on."""
+
+    def __init__(
+        self,
+        fast: str = "pypdf",
+        ocr: str = "nougat",
+        threshold: float = QUALITY_THRESHOLD,
+        fast_options: Optional[Dict] = None,
+        ocr_options: Optional[Dict] = None,
+    ):
+        self.fast = get_extractor(fast, **(fast_options or {}))
+        self.ocr = get_extractor(ocr, **(ocr_options or {}))
+        if not isinstance(self.fast, PageExtractor):
+            raise ValueError(f"{fast!r} cannot extract single pages")
+        if not isinstance(self.ocr, RangeExtractor):
+            raise ValueError(f"{ocr!r} cannot extract selected pages")
+        self.threshold = threshold
+        self.stats = {"pages": 0, "ocr_pages": 0}
+
+    async def extract_text(self, pdf_path: Path) -> Optional[str]:
+        try:
+            texts = await self.fast.extract_pages(pdf_path)
+            self.stats["pages"] += len(texts)
+            self.stats["ocr_pages"] += sum(
+                score_page(text) < self.threshold for text in texts
+            )
+            texts = await cascade_pages(texts, self.ocr, pdf_path, self.threshold)
+        except Exception as e:
+            print(f"Error extracting text from {pdf_path} with cascade: {e}")
+            return None
+        return "\n\n".join(text for text in texts if text)
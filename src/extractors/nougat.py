@@ -0,0 +1,86 @@
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import aiofiles
+
+from .base import RangeExtractor, contiguous_ranges, register_extractor
+
+# Failing runs this few pages apart share one Nougat process (and model
+# load); the good pages between them are OCRed too
+MERGE_GAP = 3
+
+
+async def run_nougat(
+    command: str,
+    pdf_paths: Sequence[Path],
+    out_dir: Path,
+    page_range: Optional[str] = None,
+) -> Tuple[int, str]:
+    """Run one Nougat process; it writes ``<stem>.mmd`` per PDF into out_dir.
+
+    Returns the exit code and the tail of stderr.
+    """
+    args = [*(str(p) for p in pdf_paths), "--out", str(out_dir)]
+    if page_range:
+        args += ["--pages", page_range]
+    process = await asyncio.create_subprocess_exec(
+        command,
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    return process.returncode, stderr.decode(errors="replace")[-2000:]
+
+
+@register_extractor("nougat")
+class NougatExtractor(RangeExtractor):
+    """ML-based OCR with Nougat; slow, but handles scans and math.
+
+    Every process loads the model, so they are bounded by ``semaphore``
+    (one at a time unless given), which callers can share with their own
+    Nougat runs.
+    """
+
+    def __init__(
+        self,
+        command: str = "nougat",
+        semaphore: Optional[asyncio.Semaphore] = None,
+        merge_gap: int = MERGE_GAP,
+    ):
+        self.command = command
+        self.semaphore = semaphore or asyncio.Semaphore(1)
+        self.merge_gap = merge_gap
+
+    async def _run(self, pdf_path: Path, page_range: Optional[str] = None) -> str:
+        with tempfile.TemporaryDirectory() as out_dir:
+            async with self.semaphore:
+                returncode, stderr = await run_nougat(
+                    self.command, [pdf_path], Path(out_dir), page_range
+                )
+            output_path = Path(out_dir) / f"{pdf_path.stem}.mmd"
+            if not output_path.exists():
+                raise RuntimeError(f"Nougat exited with {returncode}: {stderr}")
+            async with aiofiles.open(output_path, "r", encoding="utf-8") as f:
+                return await f.read()
+
+    async def extract_ranges(
+        self, pdf_path: Path, pages: List[int]
+    ) -> Dict[Tuple[int, int], str]:
+        """Run Nougat once per run of pages, runs up to merge_gap apart joined.
+
+        Nougat does not report page boundaries, so there is one text per run.
+        """
+        return {
+            (first, last): await self._run(pdf_path, f"{first + 1}-{last + 1}")
+            for first, last in contiguous_ranges(pages, self.merge_gap)
+        }
+
+    async def extract_text(self, pdf_path: Path) -> Optional[str]:
+        try:
+            return await self._run(pdf_path)
+        except Exception as e:
+            print(f"Error extracting text from {pdf_path} with Nougat: {e}")
+            return None
@@ -0,0 +1,33 @@
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+import PyPDF2
+
+from .base import PageExtractor, register_extractor
+
+
+def _read_pages(pdf_path: Path, pages: Optional[List[int]]) -> List[str]:
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        if pages is None:
+            pages = range(len(reader.pages))
+        return [reader.pages[i].extract_text() or "" for i in pages]
+
+
+@register_extractor("pypdf")
+class PyPDFExtractor(PageExtractor):
+    """Fast text-layer extraction with PyPDF2."""
+
+    async def extract_pages(
+        self, pdf_path: Path, pages: Optional[List[int]] = None
+    ) -> List[str]:
+        # PyPDF2 is synchronous and CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(_read_pages, pdf_path, pages)
+
+    async def extract_text(self, pdf_path: Path) -> Optional[str]:
+        try:
+            return "\n\n".join(await self.extract_pages(pdf_path))
+        except Exception as e:
+            print(f"Error extracting text from {pdf_path} with PyPDF2: {e}")
+            return None
@@ -0,0 +1,26 @@
+import re
+
+MIN_CHARS = 100  # Less text than this usually means a scanned or image-only page
+# PyPDF2 leaves unmapped glyphs as (cid:N), U+FFFD, private-use or control chars
+_GARBAGE = re.compile(r"\(cid:\d+\)|[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def score_page(text: str) -> float:
+    """Score how usable a page's text layer is, from 0 (useless) to 1 (clean).
+
+    Penalizes pages that are (nearly) empty, pages with a high share of
+    undecodable glyphs, pages with little alphabetic text, and pages broken
+    into many one-to-three character lines, which is what PyPDF2 makes of
+    typeset equations.
+    """
+    stripped = text.strip()
+    if len(stripped) < MIN_CHARS:
+        return 0.0
+
+    garbage = sum(len(m) for m in _GARBAGE.findall(stripped)) / len(stripped)
+    alpha = sum(c.isalpha() for c in stripped) / len(stripped)
+    lines = [line.strip() for line in stripped.splitlines() if line.strip()]
+    fragments = sum(1 for line in lines if len(line) <= 3) / len(lines)
+
+    penalty = max(garbage * 5, fragments, (0.5 - alpha) * 2)
+    return min(1.0, max(0.0, 1.0 - penalty))
@@ -1,29 +1,106 @@
 import asyncio
+import json
+import re
+import sys
 from pathlib import Path
 
+import aiofiles
+import aiohttp
+
 from chains.paper_collection import PaperCollectionChain
 from chains.summarization import SummarizationChain
-from chains.text_extraction import TextExtractionChain
 from config.settings import settings
+from core.pipeline import Pipeline, Stage
+from extractors import get_extractor
+
+sys.path.append(str(settings.BASE_DIR))
+
+import download_papers
+
+
+def paper_stem(title: str) -> str:
+    return re.sub(r"[^\w\-]+", "_", title).strip("_")[:150] or "untitled"
 
 
 async def main():
     # Initialize chains
     paper_chain = PaperCollectionChain()
-    extraction_chain = TextExtractionChain()
+    extractor = get_extractor(settings.EXTRACTOR)
     summary_chain = SummarizationChain()
 
     # Create necessary directories
     for dir in [settings.PAPERS_DIR, settings.MARKDOWN_DIR, settings.SUMMARIES_DIR]:
         dir.mkdir(parents=True, exist_ok=True)
 
-    # Run the pipeline
-    papers = await paper_chain.run("LLM for Security")
-    for paper in papers:
-        # Download and process each paper
-        # Extract text
-        # Generate summary
-        pass
+    # Same downloader as download_papers.py: resumable .part files, size
+    # cap, per-host rate limits and the content-addressed store
+    scheduler = download_papers.HostScheduler()
+    store_dir = settings.PAPERS_DIR / ".store"
+    store = download_papers.PaperStore(store_dir, store_dir / "manifest.json")
+
+    async with aiohttp.ClientSession(
+        connector=download_papers.make_connector()
+    ) as session:
+
+        async def download(paper: dict) -> Path | None:
+            url = paper.get("url")
+            if not url or not url.startswith(("http://", "https://")):
+                return None
+            pdf_path = settings.PAPERS_DIR / f"{paper_stem(paper['title'])}.pdf"
+            doi = paper.get("doi") or download_papers.extract_doi(url)
+            async with store.lock(url, doi):
+                return await download_papers.fetch_into_store(
+                    session,
+                    paper["title"],
+                    url,
+                    doi,
+                    ".pdf",
+                    pdf_path,
+                    scheduler,
+                    store,
+                )
+
+        async def extract(pdf_path: Path) -> Path | None:
+            markdown_path = settings.MARKDOWN_DIR / f"{pdf_path.stem}.md"
+            if markdown_path.exists():
+                return markdown_path
+            text = await extractor.extract_text(pdf_path)
+            if not await extractor.save_markdown(text, markdown_path):
+                return None
+            return markdown_path
+
+        async def summarize(markdown_path: Path) -> Path | None:
+            summary_path = settings.SUMMARIES_DIR / f"{markdown_path.stem}_summary.md"
+            if summary_path.exists():
+                return summary_path
+            async with aiofiles.open(markdown_path, "r", encoding="utf-8") as f:
+                text = await f.read()
+            summary = await summary_chain.summarize(text)
+            if not summary:
+                return None
+            async with aiofiles.open(summary_path, "w", encoding="utf-8") as f:
+                await f.write(summary)
+            return summary_path
+
+        # Run the pipeline: every stage works on whatever the previous one
+        # has finished, with bounded queues holding back a faster stage
+        pipeline = Pipeline(
+            [
+                Stage("download", download, settings.DOWNLOAD_WORKERS),
+                Stage("extract", extract, settings.EXTRACTION_WORKERS),
+                Stage("summarize", summarize, settings.SUMMARY_WORKERS),
+            ]
+        )
+        # Papers enter the pipeline as Scholar returns them
+        try:
+            summaries = await pipeline.run(paper_chain.stream("LLM for Security"))
+        finally:
+            store.save()
+
+    downloads = pipeline.stages[0].stats
+    found = downloads["done"] + downloads["dropped"] + downloads["failed"]
+    print(f"Summarized {len(summaries)} of {found} papers")
+    print(json.dumps(pipeline.report(), indent=2))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,126 @@
+import argparse
 import asyncio
+import hashlib
+import json
 import os
+import random
+import re
+import time
 from pathlib import Path
 
 import aiofiles
 import anthropic
 from tqdm import tqdm
 
+from compact_markdown import compact_text
+from near_duplicates import NearDuplicateIndex
+from paper_search import SearchIndex
+
+MODEL = "claude-3-5-sonnet-20240620"
+MAX_TOKENS = 4096
+TEMPERATURE = 0.3
+USER_PROMPT = "Please summarize this research paper:"
+# Papers longer than this are summarized map-reduce style, in chunks
+STUFF_TOKEN_LIMIT = 100_000
+CHUNK_TOKENS = 30_000
+MAP_PROMPT = (
+    "Here is part {index} of {total} of a research paper. Summarize this part, "
+    "keeping its claims, methods, numbers and any title or section names:"
+)
+REDUCE_PROMPT = (
+    "Please summarize this research paper. It was too long to send whole, so "
+    "below are summaries of its consecutive parts:"
+)
+MAX_CONCURRENT_REQUESTS = 8  # Requests in flight at once
+REQUESTS_PER_MINUTE = 50
+INPUT_TOKENS_PER_MINUTE = 40_000
+MAX_RETRIES = 5  # Retries on rate-limit, overload and connection errors
+BACKOFF_BASE = 2.0  # Seconds, doubled on every retry and jittered
+CHARS_PER_TOKEN = 4  # Rough estimate used for the input token budget
+MAX_BATCH_REQUESTS = 10_000  # Requests per Message Batches submission
+MAX_BATCH_BYTES = 200 * 1024 * 1024  # Stay under the 256 MB batch size limit
+MAX_BATCH_ATTEMPTS = 3  # Submissions per document before giving up
+BATCH_POLL_INTERVAL = 60  # Seconds between batch status checks
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_text(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """Split text into chunks of at most ``max_tokens`` estimated tokens.
+
+    Cuts go before markdown headings or, failing that, at paragraph breaks;
+    a single paragraph longer than a chunk is cut at the character limit.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    blocks = re.split(r"\n(?=#)|\n\s*\n", text)
+    chunks, current = [], ""
+    for block in blocks:
+        while len(block) > max_chars:
+            block_head, block = block[:max_chars], block[max_chars:]
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(block_head)
+        if current and len(current) + len(block) + 2 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{block}" if current else block
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def iter_text_blocks(request: dict):
+    """Yield every text block of a request, however it is laid out."""
+    system = request["system"]
+    yield from [{"text": system}] if isinstance(system, str) else system
+    for message in request["messages"]:
+        content = message["content"]
+        yield from [{"text": content}] if isinstance(content, str) else content
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute`` units a minute."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1):
+        # A single request larger than the whole budget waits for a full bucket
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+def retry_after(error: anthropic.APIStatusError) -> float | None:
+    """Seconds the server asked us to wait, if it said so."""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (anthropic.RateLimitError, anthropic.APIConnectionError)):
+        return True
+    # 529 is "overloaded"; other 5xx are transient as well
+    return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
 
 class DocumentSummarizer:
 
@@ -14,16 +129,61 @@ class DocumentSummarizer:
         input_dir: str = "markdown/pypdf",
         output_dir: str = "summaries",
         api_key: str | None = None,
+        base_url: str | None = None,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        requests_per_minute: int = REQUESTS_PER_MINUTE,
+        input_tokens_per_minute: int = INPUT_TOKENS_PER_MINUTE,
+        prompt_caching: bool = True,
+        force: bool = False,
+        compact: bool = True,
+        keep_references: bool = True,
+        skip_duplicates: bool = True,
     ):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.batch_state_path = self.output_dir / "batch_state.json"
+
+        # Summaries are only regenerated when their inputs change, or on force
+        self.force = force
+        self.cache_path = self.output_dir / "summary_cache.json"
+        self.summary_cache = {}
+        if self.cache_path.exists():
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self.summary_cache = json.load(f)
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+        # Strip extraction noise before it is hashed and sent as input tokens
+        self.compact = compact
+        self.keep_references = keep_references
+        self.compaction = {"chars_before": 0, "chars_after": 0}
 
-        # Initialize Claude client
+        # Only the canonical copy of near-identical documents is summarized
+        self.skip_duplicates = skip_duplicates
+        self.duplicates = {}
+
+        # Initialize Claude client; retries are handled by the scheduler below
         self.client = anthropic.AsyncAnthropic(
-            api_key=api_key or os.getenv("ANTHROPIC_API_KEY")
+            api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
+            base_url=base_url,
+            max_retries=0,
         )
 
+        # Scheduler limits shared by every request
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.request_budget = TokenBucket(requests_per_minute)
+        self.token_budget = TokenBucket(input_tokens_per_minute)
+
+        # Mark the shared system prompt and instruction as a cacheable prefix
+        self.prompt_caching = prompt_caching
+        self.usage = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+
         # Load system prompt from file
         prompt_path = Path("Thinking-Claude/model_instructions/v4-20241118.md")
         try:
@@ -33,14 +193,62 @@ class DocumentSummarizer:
             print(f"Error loading system prompt from {prompt_path}: {e}")
             raise
 
+    def cache_key(self, content: str) -> str:
+        """Hash of everything that determines a summary."""
+        prompts = [self.system_prompt, USER_PROMPT]
+        if estimate_tokens(content) > STUFF_TOKEN_LIMIT:
+            # Long papers also depend on how they are chunked and reduced
+            prompts += [MAP_PROMPT, REDUCE_PROMPT, str(CHUNK_TOKENS)]
+        prompt = hashlib.sha256("\0".join(prompts).encode("utf-8")).hexdigest()
+        parts = [
+            hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            MODEL,
+            prompt,
+            MAX_TOKENS,
+            TEMPERATURE,
+        ]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def is_cached(self, output_path: Path, key: str) -> bool:
+        hit = (
+            not self.force
+            and self.summary_cache.get(str(output_path)) == key
+            and output_path.exists()
+        )
+        self.cache_stats["hits" if hit else "misses"] += 1
+        return hit
+
+    def save_summary_cache(self):
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary_cache, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def markdown_files(self) -> list[Path]:
+        """Documents to summarize, leaving out near-duplicates of another one."""
+        files = sorted(self.input_dir.glob("*.md"))
+        if self.skip_duplicates and files:
+            index = NearDuplicateIndex(self.input_dir)
+            index.update()
+            self.duplicates = index.duplicates()
+            if self.duplicates:
+                print(f"Skipping {len(self.duplicates)} near-duplicate documents")
+        return [f for f in files if f.name not in self.duplicates]
+
     async def read_markdown(self, file_path: Path) -> str:
         """Read content from markdown file."""
         try:
             async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                return await f.read()
+                content = await f.read()
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
             return ""
+        if self.compact and content:
+            compacted = compact_text(content, self.keep_references)
+            self.compaction["chars_before"] += len(content)
+            self.compaction["chars_after"] += len(compacted)
+            content = compacted
+        return content
 
     async def save_summary(self, summary: str, output_path: Path) -> bool:
         """Save summary to file."""
@@ -52,25 +260,126 @@ class DocumentSummarizer:
             print(f"Error saving summary to {output_path}: {e}")
             return False
 
-    async def summarize_document(self, content: str) -> str:
-        """Generate summary using Claude API."""
-        try:
-            message = await self.client.messages.create(
-                model="claude-3-5-sonnet-20240620",
-                max_tokens=4096,
-                temperature=0.3,
-                system=self.system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"Please summarize this research paper:\n\n{content}",
-                    }
+    def build_request(self, content: str, instruction: str = USER_PROMPT) -> dict:
+        """Keyword arguments for ``messages.create`` summarizing ``content``."""
+        if not self.prompt_caching:
+            return {
+                "model": MODEL,
+                "max_tokens": MAX_TOKENS,
+                "temperature": TEMPERATURE,
+                "system": self.system_prompt,
+                "messages": [
+                    {"role": "user", "content": f"{instruction}\n\n{content}"}
                 ],
+            }
+
+        # Everything up to the last cache_control block is cached and reused
+        # by every later request with the same prefix
+        cache_control = {"type": "ephemeral"}
+        return {
+            "model": MODEL,
+            "max_tokens": MAX_TOKENS,
+            "temperature": TEMPERATURE,
+            "system": [
+                {
+                    "type": "text",
+                    "text": self.system_prompt,
+                    "cache_control": cache_control,
+                }
+            ],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": f"{instruction}\n\n",
+                            "cache_control": cache_control,
+                        },
+                        {"type": "text", "text": content},
+                    ],
+                }
+            ],
+        }
+
+    def record_usage(self, usage):
+        self.usage["requests"] += 1
+        for key in self.usage.keys() - {"requests"}:
+            self.usage[key] += getattr(usage, key, None) or 0
+
+    def usage_report(self) -> dict:
+        """Token usage for the run, including prompt cache reads and writes."""
+        report = dict(self.usage)
+        prompt_tokens = (
+            report["input_tokens"]
+            + report["cache_creation_input_tokens"]
+            + report["cache_read_input_tokens"]
+        )
+        report["summary_cache"] = dict(self.cache_stats)
+        report["duplicates_skipped"] = dict(self.duplicates)
+        saved = self.compaction["chars_before"] - self.compaction["chars_after"]
+        report["compaction"] = {
+            **self.compaction,
+            "chars_saved": saved,
+            "tokens_saved": saved // CHARS_PER_TOKEN,
+        }
+        report["cache_hit_ratio"] = (
+            report["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        )
+        return report
+
+    async def create_message(self, request: dict) -> str:
+        """Send one request within the rate budgets, retrying transient errors."""
+        input_tokens = sum(
+            estimate_tokens(block["text"]) for block in iter_text_blocks(request)
+        )
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with self.semaphore:
+                    await self.request_budget.acquire()
+                    await self.token_budget.acquire(input_tokens)
+                    message = await self.client.messages.create(**request)
+                self.record_usage(message.usage)
+                return message.content[0].text
+            except Exception as e:
+                if not is_retryable(e) or attempt == MAX_RETRIES:
+                    print(f"Error during summarization: {e}")
+                    return ""
+                delay = BACKOFF_BASE * 2**attempt * random.uniform(0.5, 1.5)
+                if isinstance(e, anthropic.APIStatusError):
+                    delay = max(delay, retry_after(e) or 0)
+                await asyncio.sleep(delay)
+
+    async def summarize_document(self, content: str) -> str:
+        """Generate summary using Claude API.
+
+        Papers that fit in STUFF_TOKEN_LIMIT are sent whole. Longer ones are
+        split with split_text, the chunks summarized concurrently, and the
+        partial summaries reduced into the usual structured summary.
+        """
+        if estimate_tokens(content) <= STUFF_TOKEN_LIMIT:
+            return await self.create_message(self.build_request(content))
+
+        chunks = split_text(content, CHUNK_TOKENS)
+        partials = await asyncio.gather(
+            *(
+                self.create_message(
+                    self.build_request(
+                        chunk, MAP_PROMPT.format(index=i, total=len(chunks))
+                    )
+                )
+                for i, chunk in enumerate(chunks, 1)
             )
-            return message.content[0].text
-        except Exception as e:
-            print(f"Error during summarization: {e}")
+        )
+        if not all(partials):
             return ""
+        combined = "\n\n".join(
+            f"## Part {i}\n\n{partial}" for i, partial in enumerate(partials, 1)
+        )
+        # A very long paper may need more than one round of reduction
+        if estimate_tokens(combined) > STUFF_TOKEN_LIMIT:
+            return await self.summarize_document(combined)
+        return await self.create_message(self.build_request(combined, REDUCE_PROMPT))
 
     async def process_single_document(self, file_path: Path):
         """Process a single document."""
@@ -80,14 +389,22 @@ class DocumentSummarizer:
             if not content:
                 return False
 
+            # Skip if the summary is up to date
+            output_path = self.output_dir / f"{file_path.stem}_summary.md"
+            key = self.cache_key(content)
+            if self.is_cached(output_path, key):
+                return True
+
             # Generate summary
             summary = await self.summarize_document(content)
             if not summary:
                 return False
 
             # Save summary
-            output_path = self.output_dir / f"{file_path.stem}_summary.md"
-            return await self.save_summary(summary, output_path)
+            if not await self.save_summary(summary, output_path):
+                return False
+            self.summary_cache[str(output_path)] = key
+            return True
 
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
@@ -95,52 +412,240 @@ class DocumentSummarizer:
 
     async def process_all_documents(self):
         """Process all markdown documents in the input directory concurrently."""
-        markdown_files = list(self.input_dir.glob("*.md"))
+        markdown_files = self.markdown_files()
 
         if not markdown_files:
             print(f"No markdown files found in {self.input_dir}")
             return
 
-        # Create tasks for all documents
-        tasks = [
-            self.process_single_document(file_path) for file_path in markdown_files
+        async def process(file_path: Path):
+            return file_path, await self.process_single_document(file_path)
+
+        # Requests are throttled inside summarize_document, so every document
+        # can be queued; the bar moves as each one completes
+        try:
+            with tqdm(total=len(markdown_files), desc="Summarizing documents") as pbar:
+                for task in asyncio.as_completed([process(f) for f in markdown_files]):
+                    file_path, success = await task
+                    if success:
+                        print(f"Successfully summarized: {file_path.name}")
+                    else:
+                        print(f"Failed to summarize: {file_path.name}")
+                    pbar.update(1)
+        finally:
+            self.save_summary_cache()
+
+    def load_batch_state(self) -> dict:
+        """Load the batch run in progress, or start one for every document."""
+        if self.batch_state_path.exists():
+            with open(self.batch_state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {
+            "documents": {
+                f"doc-{i}": {"path": str(path), "status": "queued", "attempts": 0}
+                for i, path in enumerate(self.markdown_files())
+            },
+            "batches": {},
+        }
+
+    def save_batch_state(self, state: dict):
+        tmp_path = self.batch_state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.batch_state_path)
+
+    async def submit_batches(self, state: dict):
+        """Pack every queued document into Message Batches submissions."""
+        queued = [
+            (custom_id, doc)
+            for custom_id, doc in state["documents"].items()
+            if doc["status"] == "queued"
         ]
+        requests, size = [], 0
+        for i, (custom_id, doc) in enumerate(queued):
+            content = await self.read_markdown(Path(doc["path"]))
+            if not content:
+                doc["status"] = "failed"
+            elif estimate_tokens(content) > STUFF_TOKEN_LIMIT:
+                # Map-reduce needs dependent calls a single batch cannot chain
+                doc["status"] = "interactive"
+            elif self.is_cached(self.summary_path(doc), key := self.cache_key(content)):
+                doc["status"] = "done"
+            else:
+                doc["cache_key"] = key
+                requests.append(
+                    {"custom_id": custom_id, "params": self.build_request(content)}
+                )
+                size += len(content.encode("utf-8")) + len(self.system_prompt)
+            last = i == len(queued) - 1
+            if requests and (
+                last or len(requests) >= MAX_BATCH_REQUESTS or size >= MAX_BATCH_BYTES
+            ):
+                batch = await self.client.messages.batches.create(requests=requests)
+                state["batches"][batch.id] = [r["custom_id"] for r in requests]
+                for request in requests:
+                    state["documents"][request["custom_id"]]["status"] = "submitted"
+                # Persist straight away so a crash never loses a submitted batch
+                self.save_batch_state(state)
+                print(f"Submitted batch {batch.id} with {len(requests)} documents")
+                requests, size = [], 0
 
-        # Process all documents concurrently with progress bar
-        with tqdm(total=len(markdown_files), desc="Summarizing documents") as pbar:
-            results = await asyncio.gather(*tasks)
-            for file_path, success in zip(markdown_files, results):
-                if success:
-                    print(f"Successfully summarized: {file_path.name}")
-                else:
-                    print(f"Failed to summarize: {file_path.name}")
-                pbar.update(1)
+    async def collect_batch(self, state: dict, batch_id: str):
+        """Write the results of an ended batch and re-queue its failures."""
+        custom_ids = set(state["batches"][batch_id])
+        async for entry in await self.client.messages.batches.results(batch_id):
+            doc = state["documents"].get(entry.custom_id)
+            if doc is None:
+                continue
+            custom_ids.discard(entry.custom_id)
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                self.record_usage(message.usage)
+                output_path = self.summary_path(doc)
+                if await self.save_summary(message.content[0].text, output_path):
+                    doc["status"] = "done"
+                    self.summary_cache[str(output_path)] = doc["cache_key"]
+                    continue
+            self.requeue(doc)
+        # Requests missing from the results are retried as well
+        for custom_id in custom_ids:
+            self.requeue(state["documents"][custom_id])
+        del state["batches"][batch_id]
+        self.save_summary_cache()
+        self.save_batch_state(state)
+
+    def summary_path(self, doc: dict) -> Path:
+        return self.output_dir / f"{Path(doc['path']).stem}_summary.md"
+
+    @staticmethod
+    def requeue(doc: dict):
+        doc["attempts"] += 1
+        doc["status"] = "queued" if doc["attempts"] < MAX_BATCH_ATTEMPTS else "failed"
+
+    async def process_all_documents_batch(
+        self, poll_interval: float = BATCH_POLL_INTERVAL
+    ):
+        """Summarize every document through the Message Batches API.
+
+        Batch IDs and per-document status are persisted to
+        ``batch_state.json``, so an interrupted run resumes polling its
+        batches instead of resubmitting. Failed requests are resubmitted up to
+        MAX_BATCH_ATTEMPTS times.
+        """
+        state = self.load_batch_state()
+        if not state["documents"]:
+            print(f"No markdown files found in {self.input_dir}")
+            return
+
+        while True:
+            await self.submit_batches(state)
+            if not state["batches"]:
+                break
+            for batch_id in list(state["batches"]):
+                batch = await self.client.messages.batches.retrieve(batch_id)
+                if batch.processing_status == "ended":
+                    await self.collect_batch(state, batch_id)
+            if state["batches"]:
+                await asyncio.sleep(poll_interval)
+
+        # Papers too long to send whole go through map-reduce interactively
+        interactive = [
+            doc for doc in state["documents"].values() if doc["status"] == "interactive"
+        ]
+        for doc, success in zip(
+            interactive,
+            await asyncio.gather(
+                *(
+                    self.process_single_document(Path(doc["path"]))
+                    for doc in interactive
+                )
+            ),
+        ):
+            doc["status"] = "done" if success else "failed"
+        self.save_summary_cache()
+
+        statuses = [doc["status"] for doc in state["documents"].values()]
+        print(
+            f"Batch run complete: {statuses.count('done')} summarized, "
+            f"{statuses.count('failed')} failed"
+        )
+        self.batch_state_path.unlink(missing_ok=True)
 
     async def generate_index(self):
-        """Generate an index file of all summaries."""
-        summary_files = list(self.output_dir.glob("*_summary.md"))
+        """Generate an index file of all summaries.
 
-        if not summary_files:
+        Also brings the search index up to date, which already holds the
+        title (first line) of every summary.
+        """
+        index = SearchIndex(self.input_dir, self.output_dir)
+        await asyncio.to_thread(index.update)
+        summaries = index.summary_titles()
+
+        if not summaries:
             return
 
         index_content = "# Paper Summaries Index\n\n"
-
-        for file_path in sorted(summary_files):
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                # Extract title from summary (assuming it's the first line)
-                title = content.split("\n")[0].strip("# ")
-                index_content += f"- [{title}](./{file_path.name})\n"
+        for name, title in summaries:
+            index_content += f"- [{title}](./{name})\n"
 
         await self.save_summary(index_content, self.output_dir / "index.md")
 
 
 async def main():
+    parser = argparse.ArgumentParser(description="Summarize extracted papers")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="use the Message Batches API (cheaper, results within 24h, resumable)",
+    )
+    parser.add_argument(
+        "--input-dir",
+        default="markdown/pypdf",
+        help="extracted markdown to summarize, e.g. markdown/cascade",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-summarize documents even if their cached summary is up to date",
+    )
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="send the extracted text as is, without stripping headers and noise",
+    )
+    parser.add_argument(
+        "--drop-references",
+        action="store_true",
+        help="leave the reference list out of the text sent for summarization",
+    )
+    parser.add_argument(
+        "--keep-duplicates",
+        action="store_true",
+        help="also summarize documents that are near-duplicates of another one",
+    )
+    args = parser.parse_args()
+
     # Initialize summarizer with configurable batch size
-    summarizer = DocumentSummarizer()
+    summarizer = DocumentSummarizer(
+        input_dir=args.input_dir,
+        force=args.force,
+        compact=not args.no_compact,
+        keep_references=not args.drop_references,
+        skip_duplicates=not args.keep_duplicates,
+    )
+
+    if args.batch:
+        await summarizer.process_all_documents_batch()
+    else:
+        # Process all documents concurrently
+        await summarizer.process_all_documents()
 
-    # Process all documents concurrently
-    await summarizer.process_all_documents()
+    # Report token usage, including prompt cache reads and writes
+    report = summarizer.usage_report()
+    print(json.dumps(report, indent=2))
+    await summarizer.save_summary(
+        json.dumps(report, indent=2), summarizer.output_dir / "usage_report.json"
+    )
 
     # Generate index
     await summarizer.generate_index()
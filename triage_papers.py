@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import math
+import os
+from collections import Counter
+
+import anthropic
+import numpy as np
+from tqdm import tqdm
+
+from paper_catalog import PaperCatalog
+from paper_search import B, K1, tokenize
+
+TOPIC = "LLM for Security"
+SEED_KEYWORDS = [
+    "large language model",
+    "llm",
+    "gpt",
+    "chatgpt",
+    "security",
+    "attack",
+    "adversarial",
+    "jailbreak",
+    "jailbreaking",
+    "prompt injection",
+    "vulnerability",
+    "malware",
+    "phishing",
+    "backdoor",
+    "privacy",
+    "fuzzing",
+    "penetration testing",
+    "intrusion detection",
+    "threat",
+    "exploit",
+]
+THRESHOLD = 0.35  # Relevance below which a paper is not downloaded
+MARGIN = 0.1  # Papers this close to the threshold are borderline
+MATCH_TERMS = 3  # Keywords of average weight a paper needs to score 1.0
+MODEL = "claude-3-5-haiku-20241022"  # Cheap model for borderline tie-breaks
+MAX_CONCURRENT = 8
+PROMPT = (
+    "Topic: {topic}\n\nTitle: {title}\nVenue: {venue}\nSnippet: {abstract}\n\n"
+    "Is this paper about the topic? Answer with yes or no only."
+)
+
+
+def stem(token: str) -> str:
+    """Fold plain plurals so "attacks" matches "attack" and "llms" "llm"."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def terms(text: str) -> list[str]:
+    return [stem(t) for t in tokenize(text)]
+
+
+def paper_text(paper: dict) -> str:
+    return " ".join(filter(None, (paper["title"], paper["abstract"], paper["venue"])))
+
+
+def relevance_scores(papers: list[dict], query: str) -> np.ndarray:
+    """BM25 relevance of each paper's title, snippet and venue to the query.
+
+    Every paper in the catalog already matched the search query, so the
+    topic's own words are in nearly all of them; the smoothed idf keeps
+    their weight at 1 or more instead of letting it drop to zero. Scores
+    are divided by MATCH_TERMS keywords of average weight, so 1.0 means
+    roughly "mentions three of the keywords" whatever the keyword list.
+    """
+    docs = [Counter(terms(paper_text(paper))) for paper in papers]
+    lengths = np.array([sum(doc.values()) for doc in docs], dtype=np.float64)
+    norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+    scores = np.zeros(len(docs))
+    weights = []
+    for term in set(terms(query)):
+        tf = np.array([doc[term] for doc in docs], dtype=np.float64)
+        weight = 1 + math.log((len(docs) + 1) / (np.count_nonzero(tf) + 1))
+        scores += weight * tf * (K1 + 1) / (tf + norm)
+        weights.append(weight)
+    if not weights:
+        return scores
+    return np.minimum(scores / (MATCH_TERMS * np.mean(weights)), 1.0)
+
+
+class LLMJudge:
+    """Asks a small model whether borderline papers are on topic."""
+
+    def __init__(
+        self, topic: str, model: str = MODEL, max_concurrent: int = MAX_CONCURRENT
+    ):
+        self.topic = topic
+        self.model = model
+        self.client = anthropic.AsyncAnthropic(
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            base_url=os.getenv("ANTHROPIC_BASE_URL"),
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def is_relevant(self, paper: dict, progress_bar=None) -> bool | None:
+        """The model's verdict, or None if it could not be asked."""
+        prompt = PROMPT.format(
+            topic=self.topic,
+            title=paper["title"],
+            venue=paper["venue"] or "unknown",
+            abstract=paper["abstract"] or "none",
+        )
+        try:
+            async with self.semaphore:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=5,
+                    temperature=0,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+        except Exception as e:
+            print(f"\nCould not judge {paper['title']!r}: {e}")
+            return None
+        finally:
+            if progress_bar is not None:
+                progress_bar.update(1)
+        return response.content[0].text.strip().lower().startswith("yes")
+
+
+async def triage(
+    topic: str = TOPIC,
+    keywords: list[str] = SEED_KEYWORDS,
+    threshold: float = THRESHOLD,
+    margin: float = MARGIN,
+    use_llm: bool = False,
+    dry_run: bool = False,
+) -> Counter:
+    """Score every catalog entry and record which ones are worth downloading.
+
+    Papers scoring within ``margin`` of the threshold are put to the model
+    when ``use_llm`` is set; an earlier model verdict is reused as long as
+    the paper stays borderline. Returns counts of the decisions.
+    """
+    catalog = PaperCatalog()
+    try:
+        papers = list(catalog.papers())
+        scores = relevance_scores(papers, " ".join([topic, *keywords]))
+        verdicts, borderline = {}, []
+        for paper, score in zip(papers, scores.tolist()):
+            verdicts[paper["id"]] = (score, score >= threshold, "score")
+            if use_llm and abs(score - threshold) < margin:
+                if paper["judged_by"] == "llm":
+                    verdicts[paper["id"]] = (score, bool(paper["relevant"]), "llm")
+                else:
+                    borderline.append(paper)
+
+        if borderline:
+            judge = LLMJudge(topic)
+            with tqdm(total=len(borderline), desc="Judging borderline") as progress_bar:
+                results = await asyncio.gather(
+                    *(judge.is_relevant(paper, progress_bar) for paper in borderline)
+                )
+            for paper, relevant in zip(borderline, results):
+                # Papers the model could not judge fall back to the threshold
+                if relevant is not None:
+                    score = verdicts[paper["id"]][0]
+                    verdicts[paper["id"]] = (score, relevant, "llm")
+
+        if not dry_run:
+            catalog.set_relevance(
+                (paper_id, *verdict) for paper_id, verdict in verdicts.items()
+            )
+    finally:
+        catalog.close()
+
+    return Counter(
+        ("kept" if relevant else "dropped") + (" by llm" if judged_by == "llm" else "")
+        for _, relevant, judged_by in verdicts.values()
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Score collected papers against the topic before downloading"
+    )
+    parser.add_argument(
+        "--topic", default=TOPIC, help="topic the papers should be about"
+    )
+    parser.add_argument(
+        "--keywords",
+        nargs="+",
+        default=SEED_KEYWORDS,
+        help="seed keywords scored along with the topic",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="relevance below which a paper is not downloaded",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=MARGIN,
+        help="distance from the threshold that counts as borderline",
+    )
+    parser.add_argument(
+        "--llm",
+        action="store_true",
+        help="ask a small Claude model to decide borderline papers",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the counts without recording them in the catalog",
+    )
+    args = parser.parse_args()
+
+    counts = await triage(
+        args.topic, args.keywords, args.threshold, args.margin, args.llm, args.dry_run
+    )
+    print(
+        ", ".join(f"{count} {decision}" for decision, count in sorted(counts.items()))
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())